@@ -2,24 +2,29 @@
 param(
     [string]$Command,
     [string]$FontPath,
-    [string]$FontName
+    [string]$FontName,
+    [string]$Manifest
 )
 
+function Invoke-Register {
+    param($Path, $Name)
+    $dest = Join-Path $env:WINDIR\Fonts (Split-Path $Path -Leaf)
+
+    # Copy if not in Fonts folder
+    if ($Path -ne $dest) {
+        Copy-Item -Path $Path -Destination $dest -Force -ErrorAction Stop
+    }
+
+    # Registry
+    $regName = $Name + " (TrueType)" # Simplification, ideally we detect type
+    New-ItemProperty -Path 'HKLM:\SOFTWARE\Microsoft\Windows NT\CurrentVersion\Fonts' `
+        -Name $regName -PropertyType String -Value (Split-Path $dest -Leaf) -Force | Out-Null
+}
+
 function Register-Font {
     param($Path, $Name)
     try {
-        $dest = Join-Path $env:WINDIR\Fonts (Split-Path $Path -Leaf)
-        
-        # Copy if not in Fonts folder
-        if ($Path -ne $dest) {
-            Copy-Item -Path $Path -Destination $dest -Force -ErrorAction Stop
-        }
-
-        # Registry
-        $regName = $Name + " (TrueType)" # Simplification, ideally we detect type
-        New-ItemProperty -Path 'HKLM:\SOFTWARE\Microsoft\Windows NT\CurrentVersion\Fonts' `
-            -Name $regName -PropertyType String -Value (Split-Path $dest -Leaf) -Force | Out-Null
-            
+        Invoke-Register -Path $Path -Name $Name
         Write-Host "SUCCESS"
     } catch {
         Write-Host "ERROR: $_"
@@ -27,39 +32,66 @@ function Register-Font {
     }
 }
 
+# One JSON line per manifest entry, flushed immediately so the caller can stream results
+function Write-Result {
+    param($Id, $Status, $Message)
+    $line = @{ id = $Id; status = $Status; message = "$Message" } | ConvertTo-Json -Compress
+    [Console]::Out.WriteLine($line)
+    [Console]::Out.Flush()
+}
+
+function Invoke-Batch {
+    param($ManifestPath, [scriptblock]$Action)
+    # Assign first: Windows PowerShell 5.1 emits the parsed array as a single object
+    $items = Get-Content -Raw -Encoding UTF8 -Path $ManifestPath | ConvertFrom-Json
+    $items = @($items)
+    for ($i = 0; $i -lt $items.Count; $i++) {
+        try {
+            & $Action $items[$i]
+            Write-Result -Id $i -Status "SUCCESS"
+        } catch {
+            Write-Result -Id $i -Status "ERROR" -Message $_
+        }
+    }
+}
+
 function Restart-Explorer {
     Stop-Process -Name explorer -Force
     Write-Host "RESTARTED"
 }
 
-function Unregister-Font {
-    param($FontName, $FileName)
-    try {
-        $regPath = 'HKLM:\SOFTWARE\Microsoft\Windows NT\CurrentVersion\Fonts'
-        
-        # 1. Remove from Registry
-        # We need to find the exact registry key. $FontName might be the key name or part of it.
-        # If we have the exact key name, great. If not, we search by value ($FileName).
-        
-        $targetKey = $null
-        $props = Get-ItemProperty -Path $regPath
-        foreach ($prop in $props.PSObject.Properties) {
-            if ($prop.Value -eq $FileName) {
-                $targetKey = $prop.Name
-                break
-            }
-        }
+function Invoke-Unregister {
+    param($FileName)
+    $regPath = 'HKLM:\SOFTWARE\Microsoft\Windows NT\CurrentVersion\Fonts'
 
-        if ($targetKey) {
-            Remove-ItemProperty -Path $regPath -Name $targetKey -Force -ErrorAction Stop
-        }
+    # 1. Remove from Registry
+    # We need to find the exact registry key. $FontName might be the key name or part of it.
+    # If we have the exact key name, great. If not, we search by value ($FileName).
 
-        # 2. Delete File
-        $fontPath = Join-Path $env:WINDIR\Fonts $FileName
-        if (Test-Path $fontPath) {
-            Remove-Item -Path $fontPath -Force -ErrorAction SilentlyContinue
+    $targetKey = $null
+    $props = Get-ItemProperty -Path $regPath
+    foreach ($prop in $props.PSObject.Properties) {
+        if ($prop.Value -eq $FileName) {
+            $targetKey = $prop.Name
+            break
         }
-            
+    }
+
+    if ($targetKey) {
+        Remove-ItemProperty -Path $regPath -Name $targetKey -Force -ErrorAction Stop
+    }
+
+    # 2. Delete File
+    $fontPath = Join-Path $env:WINDIR\Fonts $FileName
+    if (Test-Path $fontPath) {
+        Remove-Item -Path $fontPath -Force -ErrorAction SilentlyContinue
+    }
+}
+
+function Unregister-Font {
+    param($FontName, $FileName)
+    try {
+        Invoke-Unregister -FileName $FileName
         Write-Host "SUCCESS"
     } catch {
         Write-Host "ERROR: $_"
@@ -72,6 +104,30 @@ if ($Command -eq "register") {
 } elseif ($Command -eq "unregister") {
     # For unregister, FontPath acts as FileName (e.g. arial.ttf)
     Unregister-Font -FileName $FontPath 
+} elseif ($Command -eq "register-batch") {
+    # Manifest: JSON array of { "path": ..., "name": ... }
+    Invoke-Batch -ManifestPath $Manifest -Action { param($item) Invoke-Register -Path $item.path -Name $item.name }
+} elseif ($Command -eq "serve") {
+    # Long-lived host: one JSON request per stdin line, one JSON result line back.
+    # Requests: { "id": n, "op": "register"|"unregister"|"restart-explorer"|"ping", "path": ..., "name": ... }
+    while ($null -ne ($line = [Console]::In.ReadLine())) {
+        if (-not $line.Trim()) { continue }
+        $id = $null
+        try {
+            $req = $line | ConvertFrom-Json
+            $id = $req.id
+            switch ($req.op) {
+                "register" { Invoke-Register -Path $req.path -Name $req.name }
+                "unregister" { Invoke-Unregister -FileName $req.path }
+                "restart-explorer" { Stop-Process -Name explorer -Force }
+                "ping" { }
+                default { throw "Unknown op: $($req.op)" }
+            }
+            Write-Result -Id $id -Status "SUCCESS"
+        } catch {
+            Write-Result -Id $id -Status "ERROR" -Message $_
+        }
+    }
 } elseif ($Command -eq "restart-explorer") {
     Restart-Explorer
 } else {
@@ -0,0 +1,356 @@
+import io
+import os
+import json
+import subprocess
+import threading
+import unicodedata
+from collections import OrderedDict
+from PIL import Image, ImageFont, ImageDraw
+
+from config import FONT_TOOL
+from sfnt import SfntReader, SfntError
+from archive import is_member_path, read_source, source_stat, normalize_source
+from coverage import encode_coverage
+
+PREVIEW_POINT_SIZE = 40
+FACE_CACHE_ENTRIES = 64
+FACE_CACHE_BYTES = 64 * 1024 * 1024
+GLYPH_CACHE_BYTES = 16 * 1024 * 1024
+
+# --- Qt-free font analysis ---
+# Everything here can run in a worker process: it only needs the file path
+# and returns plain, picklable data. core.py wraps it with caching and Qt.
+
+class FontInspection:
+    """Result of reading one font file: metadata, validity, checksums and cmap coverage"""
+
+    def __init__(self, path, size, mtime, metadata, valid, face_index=0, error=None,
+                 content_hash=None, coverage=None, crc32=None):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.metadata = metadata
+        self.valid = valid
+        self.face_index = face_index
+        self.error = error
+        self.content_hash = content_hash
+        self.crc32 = crc32
+        self.coverage = coverage or b''  # see coverage.py
+
+    @property
+    def key(self):
+        return (self.path, self.size, self.mtime)
+
+def _font_tool_validate(file_path):
+    if not os.path.exists(FONT_TOOL):
+        return False
+    try:
+        result = subprocess.run([FONT_TOOL, "validate", file_path], capture_output=True, creationflags=subprocess.CREATE_NO_WINDOW)
+        return result.returncode == 0
+    except: return False
+
+def _font_tool_analyze(file_path):
+    if not os.path.exists(FONT_TOOL):
+        return {"name": os.path.basename(file_path), "family": os.path.basename(file_path), "style": "Regular"}
+    try:
+        result = subprocess.run([FONT_TOOL, "analyze", file_path], capture_output=True, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
+        if result.returncode == 0:
+            return json.loads(result.stdout)
+        return {"name": os.path.basename(file_path), "error": "Analysis Error"}
+    except Exception as e:
+        return {"name": os.path.basename(file_path), "error": str(e)}
+
+def parse_font(path, size, mtime, lookup_hash=None, data=None, checksums=None):
+    """Single pass over the file; returns (FontInspection, from_hash_lookup).
+
+    `lookup_hash(content_hash, size)` may return an already known result for
+    the same bytes, in which case the tables are not decoded at all.
+    `checksums` is (content_hash, crc32) when the caller already hashed the
+    file: it is not hashed again (nor opened, if lookup_hash knows it).
+    Archive members are read from `data` (or from the archive if not given).
+    """
+    content_hash, crc32 = checksums or (None, None)
+    if checksums is not None:
+        cached = lookup_hash(content_hash, size) if lookup_hash else None
+        if cached is not None:
+            return FontInspection(path, size, mtime, cached.metadata, cached.valid,
+                                  content_hash=content_hash, coverage=cached.coverage, crc32=crc32), True
+    if data is None:
+        data = read_source(path)
+    metadata = None
+    valid, error, coverage = False, None, b''
+    try:
+        with SfntReader(path if data is None else data) as reader:
+            if checksums is None:
+                content_hash = reader.content_hash()
+                crc32 = reader.crc32()
+                cached = lookup_hash(content_hash, size) if lookup_hash else None
+                if cached is not None:
+                    # Same bytes seen under another path
+                    return FontInspection(path, size, mtime, cached.metadata, cached.valid,
+                                          content_hash=content_hash, coverage=cached.coverage, crc32=crc32), True
+            try:
+                metadata = reader.metadata()
+                reader.validate()
+                coverage = encode_coverage(reader.cmap)
+                valid = True
+            except SfntError as e:
+                error = str(e)
+    except SfntError as e:
+        error = str(e)
+
+    if metadata is None and is_member_path(path):
+        # font_tool needs a file on disk; not worth extracting a font we cannot read
+        name = os.path.basename(path)
+        metadata = {"name": name, "family": name.rsplit('.', 1)[0], "style": "Regular", "error": error}
+    elif metadata is None:
+        # Formats the in-process reader does not handle (e.g. WOFF2) go to font_tool
+        metadata = _font_tool_analyze(path)
+        valid = _font_tool_validate(path)
+        error = None if valid else metadata.get('error', error)
+    inspection = FontInspection(path, size, mtime, metadata, valid, error=error,
+                                content_hash=content_hash, coverage=coverage, crc32=crc32)
+    return inspection, False
+
+class GlyphMetrics:
+    """What the glyph layout needs from the font: cmap, advances, kerning, units per em"""
+
+    def __init__(self, cmap, advances, kerning, units_per_em):
+        self.cmap = cmap
+        self.advances = advances
+        self.kerning = kerning
+        self.units_per_em = units_per_em
+
+    @classmethod
+    def read(cls, source, face_index=0):
+        """Metrics of a face, or None if a table the layout needs is missing"""
+        try:
+            with SfntReader(source, face_index) as reader:
+                head, cmap, advances = reader.head, reader.cmap, reader.advances
+                if not head or not head['units_per_em'] or not cmap or not advances:
+                    return None
+                return cls(cmap, advances, reader.kerning, head['units_per_em'])
+        except (SfntError, OSError, ValueError):
+            return None
+
+
+class _Face:
+    def __init__(self, key, font, stamp, cost):
+        self.key = key
+        self.font = font
+        self.stamp = stamp
+        self.cost = cost
+        self.metrics = None
+        self.metrics_read = False
+
+
+class FaceCache:
+    """Bounded LRU of opened FreeType faces, keyed by (source, point size, face index).
+
+    Each entry is charged the font file's size (FreeType keeps the font data
+    around while the face is open); the oldest faces are dropped once either
+    the entry count or the byte budget is exceeded. A face whose file changed
+    since it was opened is reopened. FreeType faces are not thread-safe, so
+    callers draw with a face while holding `lock`.
+    """
+
+    def __init__(self, max_entries=FACE_CACHE_ENTRIES, max_bytes=FACE_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.lock = threading.RLock()
+        self._faces = OrderedDict()  # key -> _Face
+
+    def entry(self, file_path, point_size=PREVIEW_POINT_SIZE, face_index=0, data=None):
+        key = (normalize_source(file_path), point_size, face_index)
+        stamp = source_stat(file_path)
+        with self.lock:
+            face = self._faces.get(key)
+            if face is not None and face.stamp == stamp:
+                self._faces.move_to_end(key)
+                return face
+            if data is None:
+                data = read_source(file_path)
+            font = ImageFont.truetype(file_path if data is None else io.BytesIO(data), point_size, index=face_index)
+            if face is not None:
+                self.bytes -= self._faces.pop(key).cost
+            face = _Face(key, font, stamp, stamp[0])
+            self._faces[key] = face
+            self.bytes += face.cost
+            while len(self._faces) > 1 and (len(self._faces) > self.max_entries or self.bytes > self.max_bytes):
+                self.bytes -= self._faces.popitem(last=False)[1].cost
+            return face
+
+    def get(self, file_path, point_size=PREVIEW_POINT_SIZE, face_index=0, data=None):
+        return self.entry(file_path, point_size, face_index, data).font
+
+    def metrics(self, face, file_path, data=None):
+        """GlyphMetrics of a cached face (read once per face), or None"""
+        with self.lock:
+            if not face.metrics_read:
+                if data is None:
+                    data = read_source(file_path)
+                face.metrics = GlyphMetrics.read(file_path if data is None else data, face.key[2])
+                face.metrics_read = True
+            return face.metrics
+
+    def clear(self):
+        with self.lock:
+            self._faces.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._faces)
+
+face_cache = FaceCache()
+
+
+class GlyphCache:
+    """LRU of rasterised glyph masks keyed by (face, glyph id), within a byte budget"""
+
+    def __init__(self, max_bytes=GLYPH_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._glyphs = OrderedDict()  # key -> (mask or None, x offset, y offset, cost)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            glyph = self._glyphs.get(key)
+            if glyph is not None:
+                self._glyphs.move_to_end(key)
+            return glyph
+
+    def put(self, key, mask, x, y):
+        cost = 64 + (mask.width * mask.height if mask is not None else 0)
+        glyph = (mask, x, y, cost)
+        with self._lock:
+            old = self._glyphs.pop(key, None)
+            if old is not None:
+                self.bytes -= old[3]
+            self._glyphs[key] = glyph
+            self.bytes += cost
+            while self.bytes > self.max_bytes and len(self._glyphs) > 1:
+                self.bytes -= self._glyphs.popitem(last=False)[1][3]
+        return glyph
+
+    def clear(self):
+        with self._lock:
+            self._glyphs.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._glyphs)
+
+glyph_cache = GlyphCache()
+
+def _simple_text(text):
+    """Text that needs no shaping: Latin, Greek and Cyrillic without combining marks or line breaks"""
+    return all(' ' <= c < '\u0590' and not unicodedata.combining(c) for c in text)
+
+def _rasterize_glyph(face, char, gid):
+    """Coverage mask of one glyph, positioned relative to the pen on the baseline"""
+    key = (face.key, face.stamp, gid)
+    glyph = glyph_cache.get(key)
+    if glyph is None:
+        x0, y0, x1, y1 = face.font.getbbox(char, anchor='ls')
+        mask = None
+        if x1 > x0 and y1 > y0:
+            mask = Image.new("L", (x1 - x0, y1 - y0), 0)
+            ImageDraw.Draw(mask).text((-x0, -y0), char, font=face.font, fill=255, anchor='ls')
+        glyph = glyph_cache.put(key, mask, x0, y0)
+    return glyph
+
+def _compose_glyphs(image, file_path, text, face_index, data):
+    """Draw `text` centred from cached glyph masks, laid out with hmtx advances and
+    'kern' pairs. Returns False when the text or font needs the full renderer.
+    """
+    if not _simple_text(text):
+        return False
+    face = face_cache.entry(file_path, PREVIEW_POINT_SIZE, face_index, data)
+    metrics = face_cache.metrics(face, file_path, data)
+    if metrics is None:
+        return False
+    scale = PREVIEW_POINT_SIZE / metrics.units_per_em
+    placed = []
+    pen, previous = 0.0, None
+    for char in text:
+        gid = metrics.cmap.get(ord(char), 0)
+        if gid == 0 or gid >= len(metrics.advances):
+            # Missing glyph: let FreeType draw its .notdef
+            return False
+        if previous is not None:
+            pen += metrics.kerning.get((previous, gid), 0) * scale
+        mask, x, y, _ = _rasterize_glyph(face, char, gid)
+        if mask is not None:
+            placed.append((mask, round(pen) + x, y))
+        pen += metrics.advances[gid] * scale
+        previous = gid
+    if not placed:
+        return True
+    left = min(x for _, x, _ in placed)
+    top = min(y for _, _, y in placed)
+    right = max(x + mask.width for mask, x, _ in placed)
+    bottom = max(y + mask.height for mask, _, y in placed)
+    dx = round((image.width - (right - left)) / 2 - left)
+    dy = round((image.height - (bottom - top)) / 2 - top)
+    for mask, x, y in placed:
+        image.paste(255, (x + dx, y + dy), mask)
+    return True
+
+def render_preview(file_path, text="Aa", size=(300, 64), face_index=0, valid=True, data=None):
+    """Draw `text` centred with the given font (from `data` if given) as an 8-bit coverage mask.
+
+    The mask has no colour; it is tinted with the theme's text colour when
+    it is turned into a pixmap, so a theme switch never re-renders it.
+    """
+    image = Image.new("L", size, 0)
+    draw = ImageDraw.Draw(image)
+    with face_cache.lock:
+        # Common case: compose from cached glyphs, so only glyphs never drawn before are rasterised
+        if valid:
+            try:
+                if _compose_glyphs(image, file_path, text, face_index, data):
+                    return image
+            except Exception:
+                image.paste(0, (0, 0, *size))
+        # Known-bad files are not handed to FreeType again
+        if not valid:
+            font = ImageFont.load_default()
+        else:
+            try: font = face_cache.get(file_path, PREVIEW_POINT_SIZE, face_index, data)
+            except: font = ImageFont.load_default()
+
+        bbox = draw.textbbox((0, 0), text, font=font)
+        x = (size[0] - (bbox[2] - bbox[0])) / 2
+        y = (size[1] - (bbox[3] - bbox[1])) / 2 - bbox[1]
+        draw.text((x, y), text, font=font, fill=255)
+    return image
+
+def analyze_job(path, parse=True, preview_text="Aa", preview_size=(300, 64), checksums=None):
+    """Process-pool entry point: parse (unless already known) and render the preview.
+
+    `checksums` are passed on to parse_font. Returns a dict of picklable
+    values; the preview is the raw mask bytes because QPixmap can only be
+    built on the Qt side.
+    """
+    result = {'path': path, 'inspection': None, 'preview': None, 'error': None}
+    try:
+        size, mtime = source_stat(path)
+        # Archive members are decompressed once for both parsing and preview
+        data = read_source(path)
+        inspection = None
+        if parse:
+            inspection, _ = parse_font(normalize_source(path), size, mtime, data=data, checksums=checksums)
+            result['inspection'] = inspection
+        valid = inspection.valid if inspection else True
+        face_index = inspection.face_index if inspection else 0
+        try:
+            image = render_preview(path, preview_text, preview_size, face_index, valid, data)
+            result['preview'] = (image.size, image.tobytes())
+        except Exception:
+            # No preview; the card falls back to its icon
+            pass
+    except Exception as e:
+        result['error'] = str(e)
+    return result
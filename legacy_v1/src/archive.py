@@ -0,0 +1,239 @@
+import io
+import os
+import tarfile
+import zipfile
+import threading
+from collections import OrderedDict
+
+# --- Archive members as font sources ---
+# Fonts inside a zip/tar are never extracted to a folder. They are named by a
+# virtual path "<archive>::<member>" ("::" repeats for nested archives) and
+# their bytes are read straight from the archive when analysis or preview
+# needs them. Only fonts that actually get installed are written to disk
+# (materialize_member).
+
+MEMBER_SEP = "::"
+FONT_EXTENSIONS = ('.ttf', '.otf', '.woff', '.ttc')
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+MAX_NESTING = 3
+
+LISTING_CACHE_SIZE = 32
+NESTED_CACHE_SIZE = 4
+OPEN_HANDLES = 4
+
+
+class ArchiveMember:
+    """Central-directory entry of a font or nested archive (crc is None for tar members)"""
+
+    def __init__(self, name, size, crc=None):
+        self.name = name
+        self.size = size
+        self.crc = crc
+
+
+def is_archive(path):
+    return path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+def is_font_name(path):
+    return path.lower().endswith(FONT_EXTENSIONS)
+
+def is_member_path(path):
+    return MEMBER_SEP in path
+
+def member_path(archive_path, *names):
+    return MEMBER_SEP.join((archive_path, *names))
+
+def split_member_path(path):
+    """'<archive>::a.zip::b.ttf' -> ('<archive>', ['a.zip', 'b.ttf'])"""
+    archive_path, *names = path.split(MEMBER_SEP)
+    return archive_path, names
+
+def normalize_source(path):
+    """Cache key for a font source; only the file system part is case-folded"""
+    archive_path, names = split_member_path(path)
+    return member_path(os.path.normcase(os.path.abspath(archive_path)), *names)
+
+def source_exists(path):
+    return os.path.exists(split_member_path(path)[0])
+
+
+class _ZipArchive:
+    def __init__(self, fileobj):
+        self._zip = zipfile.ZipFile(fileobj)
+
+    def members(self):
+        for info in self._zip.infolist():
+            if not info.is_dir():
+                yield ArchiveMember(info.filename, info.file_size, info.CRC)
+
+    def read(self, name):
+        return self._zip.read(name)
+
+    def close(self):
+        self._zip.close()
+
+
+class _TarArchive:
+    def __init__(self, fileobj):
+        self._tar = tarfile.open(fileobj=fileobj, mode='r:*')
+
+    def members(self):
+        for info in self._tar.getmembers():
+            if info.isfile():
+                yield ArchiveMember(info.name, info.size)
+
+    def read(self, name):
+        member = self._tar.extractfile(name)
+        if member is None:
+            raise KeyError(name)
+        with member:
+            return member.read()
+
+    def close(self):
+        self._tar.close()
+
+
+def _open_archive(name, fileobj):
+    if name.lower().endswith('.zip'):
+        return _ZipArchive(fileobj)
+    return _TarArchive(fileobj)
+
+
+class _LRU:
+    """Small thread-safe LRU dict"""
+
+    def __init__(self, capacity, on_evict=None):
+        self.capacity = capacity
+        self.on_evict = on_evict
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        evicted = []
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                evicted.append(self._items.popitem(last=False)[1])
+        if self.on_evict:
+            for old in evicted:
+                self.on_evict(old)
+
+    def clear(self):
+        with self._lock:
+            items, self._items = list(self._items.values()), OrderedDict()
+        if self.on_evict:
+            for old in items:
+                self.on_evict(old)
+
+
+_listings = _LRU(LISTING_CACHE_SIZE)
+_nested = _LRU(NESTED_CACHE_SIZE)
+_local = threading.local()
+
+
+def _archive_stamp(archive_path):
+    st = os.stat(archive_path)
+    return st.st_size, st.st_mtime_ns
+
+def _top_level(archive_path, stamp):
+    """Open handle on an archive file; a few are kept per thread to avoid re-reading the central directory"""
+    handles = getattr(_local, 'handles', None)
+    if handles is None:
+        handles = _local.handles = _LRU(OPEN_HANDLES, on_evict=lambda archive: archive.close())
+    key = (os.path.abspath(archive_path), stamp)
+    archive = handles.get(key)
+    if archive is None:
+        archive = _open_archive(archive_path, open(archive_path, 'rb'))
+        handles.put(key, archive)
+    return archive
+
+def _open_chain(archive_path, names, stamp):
+    """Archive object containing the last name of `names` (opening nested archives on the way)"""
+    archive = _top_level(archive_path, stamp)
+    for depth in range(len(names) - 1):
+        key = (os.path.abspath(archive_path), stamp, tuple(names[:depth + 1]))
+        data = _nested.get(key)
+        if data is None:
+            data = archive.read(names[depth])
+            _nested.put(key, data)
+        archive = _open_archive(names[depth], io.BytesIO(data))
+    return archive
+
+def _listing(archive_path, names, stamp):
+    """{name: ArchiveMember} of the archive reached through `names`"""
+    key = (os.path.abspath(archive_path), stamp, tuple(names))
+    listing = _listings.get(key)
+    if listing is None:
+        archive = _open_chain(archive_path, [*names, None], stamp)
+        listing = {member.name: member for member in archive.members()}
+        _listings.put(key, listing)
+    return listing
+
+def member_info(path):
+    """ArchiveMember for a virtual path, from the (cached) central directory"""
+    archive_path, names = split_member_path(path)
+    stamp = _archive_stamp(archive_path)
+    try:
+        return _listing(archive_path, names[:-1], stamp)[names[-1]]
+    except KeyError:
+        raise FileNotFoundError(path)
+
+def source_stat(path):
+    """(size, mtime_ns) of a font file or archive member; members carry their archive's mtime"""
+    if not is_member_path(path):
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+    archive_path, _ = split_member_path(path)
+    return member_info(path).size, _archive_stamp(archive_path)[1]
+
+def read_member(path):
+    """Uncompressed bytes of one archive member"""
+    archive_path, names = split_member_path(path)
+    stamp = _archive_stamp(archive_path)
+    try:
+        return _open_chain(archive_path, names, stamp).read(names[-1])
+    except KeyError:
+        raise FileNotFoundError(path)
+
+def read_source(path):
+    """Bytes of a member, or None for a plain file (read it via its path instead)"""
+    return read_member(path) if is_member_path(path) else None
+
+def archive_font_members(archive_path, _names=(), _stamp=None):
+    """Virtual paths of every font in an archive, looking into nested archives"""
+    stamp = _stamp or _archive_stamp(archive_path)
+    fonts = []
+    for member in _listing(archive_path, list(_names), stamp).values():
+        names = (*_names, member.name)
+        if is_font_name(member.name):
+            fonts.append(member_path(archive_path, *names))
+        elif is_archive(member.name) and len(names) < MAX_NESTING:
+            try:
+                fonts.extend(archive_font_members(archive_path, names, stamp))
+            except (OSError, zipfile.BadZipFile, tarfile.TarError, EOFError) as e:
+                print(f"Skipping nested archive {member.name}: {e}")
+    return fonts
+
+def materialize_member(path, dest_dir):
+    """Write a member to dest_dir under its own file name and return the new path"""
+    name = os.path.basename(split_member_path(path)[1][-1])
+    dest = os.path.join(dest_dir, name)
+    with open(dest, 'wb') as f:
+        f.write(read_member(path))
+    return dest
+
+def close_archives():
+    """Drop cached listings and close this thread's open archive handles"""
+    _listings.clear()
+    _nested.clear()
+    handles = getattr(_local, 'handles', None)
+    if handles is not None:
+        handles.clear()
@@ -0,0 +1,259 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+from search import SearchIndex
+
+# --- Google Fonts catalog ---
+# The store browses a local catalog. Accepted sources:
+# - the JSON of the Google Fonts developer API (webfonts/v1/webfonts: "items",
+#   with a download URL per variant)
+# - the JSON behind fonts.google.com/metadata/fonts ("familyMetadataList";
+#   no download URLs)
+# - a checkout of github.com/google/fonts (one METADATA.pb per family folder;
+#   files are fetched from the checkout)
+# - a plain list of {"family", "url", ...} dicts, like config.GOOGLE_FONTS
+# Any of them is parsed once into a Catalog: per-family columns plus one bitmap
+# per facet value (a Python int, bit i = family i), so filtering is a few ANDs
+# and family details are only built for the rows a page shows.
+
+FACETS = ('category', 'subset', 'type')
+CATEGORIES = ('sans-serif', 'serif', 'display', 'handwriting', 'monospace')
+LICENSE_DIRS = ('ofl', 'apache', 'ufl')
+
+
+def _category(value):
+    """'SANS_SERIF', 'Sans Serif', 'sans-serif' -> 'sans-serif'"""
+    return '-'.join((value or '').lower().replace('_', ' ').split())
+
+def _variant(weight, italic):
+    """Developer API variant name: (400, False) -> 'regular', (700, True) -> '700italic'"""
+    weight = int(weight)
+    if weight == 400:
+        return 'italic' if italic else 'regular'
+    return f"{weight}italic" if italic else str(weight)
+
+def _subsets(values):
+    # 'menu' is the family-name-only subset, not a script
+    return [value for value in values or () if value != 'menu']
+
+
+def _from_webfonts(item):
+    return {
+        'family': item.get('family'),
+        'category': item.get('category'),
+        'subsets': _subsets(item.get('subsets')),
+        'variants': item.get('variants') or list(item.get('files') or ()),
+        'files': item.get('files') or {},
+        'axes': [axis.get('tag') for axis in item.get('axes') or ()],
+    }
+
+def _from_metadata(item):
+    variants = []
+    for key in item.get('fonts') or ():
+        italic = key.endswith('i')
+        variants.append(_variant(key.rstrip('i') or 400, italic))
+    return {
+        'family': item.get('family'),
+        'category': item.get('category'),
+        'subsets': _subsets(item.get('subsets')),
+        'variants': variants,
+        'axes': [axis.get('tag') for axis in item.get('axes') or ()],
+        'designer': ', '.join(item.get('designers') or ()),
+    }
+
+def _from_plain(item):
+    files = item.get('files') or ({'regular': item['url']} if item.get('url') else {})
+    sha256 = item.get('sha256') or {}
+    if isinstance(sha256, str):
+        sha256 = {'regular': sha256}
+    return {
+        'family': item.get('family'),
+        'category': item.get('category'),
+        'subsets': _subsets(item.get('subsets')),
+        'variants': item.get('variants') or list(files) or ['regular'],
+        'files': files,
+        'sha256': sha256,
+        'axes': item.get('axes') or [],
+        'designer': item.get('designer', ''),
+    }
+
+
+def _parse_textproto(text):
+    """METADATA.pb (protobuf text format) as nested dicts of field -> list of values"""
+    root = {}
+    stack = [root]
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.endswith('{'):
+            block = {}
+            stack[-1].setdefault(line[:-1].strip(), []).append(block)
+            stack.append(block)
+        elif line == '}':
+            if len(stack) > 1:
+                stack.pop()
+        elif ':' in line:
+            field, value = line.split(':', 1)
+            value = value.strip()
+            if value.startswith('"') and value.endswith('"') and len(value) > 1:
+                value = value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+            stack[-1].setdefault(field.strip(), []).append(value)
+    return root
+
+def _from_mirror_family(folder):
+    with open(os.path.join(folder, 'METADATA.pb'), encoding='utf-8') as f:
+        pb = _parse_textproto(f.read())
+    first = lambda block, field, default='': (block.get(field) or [default])[0]
+    files = {}
+    for font in pb.get('fonts', ()):
+        filename = first(font, 'filename')
+        if filename:
+            variant = _variant(first(font, 'weight', '400'), first(font, 'style') == 'italic')
+            files.setdefault(variant, Path(folder, filename).as_uri())
+    return {
+        'family': first(pb, 'name'),
+        'category': first(pb, 'category'),
+        'subsets': _subsets(pb.get('subsets')),
+        'variants': list(files),
+        'files': files,
+        'axes': [first(axis, 'tag') for axis in pb.get('axes', ())],
+        'designer': first(pb, 'designer'),
+    }
+
+def _families_from_mirror(root):
+    folders = [os.path.join(root, name) for name in LICENSE_DIRS if os.path.isdir(os.path.join(root, name))]
+    for folder in folders or [root]:
+        for name in sorted(os.listdir(folder)):
+            family_dir = os.path.join(folder, name)
+            if os.path.isfile(os.path.join(family_dir, 'METADATA.pb')):
+                try:
+                    yield _from_mirror_family(family_dir)
+                except (OSError, ValueError, UnicodeDecodeError) as e:
+                    print(f"Skipping {family_dir}: {e}")
+
+def _families_from_json(data):
+    if isinstance(data, dict) and 'items' in data:
+        return map(_from_webfonts, data['items'])
+    if isinstance(data, dict) and 'familyMetadataList' in data:
+        return map(_from_metadata, data['familyMetadataList'])
+    if isinstance(data, list):
+        return map(_from_plain, data)
+    raise ValueError("Unknown catalog format")
+
+
+def load_catalog(source):
+    """Catalog from a JSON file or a google/fonts checkout (OSError / ValueError if unreadable)"""
+    if os.path.isdir(source):
+        return Catalog(_families_from_mirror(source))
+    with open(source, 'rb') as f:
+        text = f.read().decode('utf-8-sig')
+    # fonts.google.com prefixes its JSON with an anti-XSSI guard
+    if text.startswith(")]}'"):
+        text = text[4:]
+    return Catalog(_families_from_json(json.loads(text)))
+
+
+def catalog_from_list(items):
+    """Catalog of {"family", "url", ...} dicts (config.GOOGLE_FONTS)"""
+    return Catalog(map(_from_plain, items))
+
+
+def _bitmap(ids, size):
+    bits = bytearray((size + 7) // 8)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, 'little')
+
+def _bit_ids(bitmap):
+    """Set bit positions of an int, lowest first"""
+    return [i for i, bit in enumerate(reversed(bin(bitmap)[2:])) if bit == '1']
+
+
+class Catalog:
+    """Google Fonts families in catalog order, with facet bitmaps and a name index.
+
+    Families are numbered by position; `select` returns those numbers and
+    `info(i)` builds the dict a GoogleFontCard shows, for one family at a time.
+    """
+
+    def __init__(self, families):
+        self.families = []      # i -> family name
+        self._ids = {}          # family name -> i
+        # Columns, one entry per family
+        self._category = []
+        self._subsets = []
+        self._variants = []
+        self._axes = []
+        self._designer = []
+        self._files = []
+        self._sha256 = []
+        self.search_index = SearchIndex()
+        values = {facet: {} for facet in FACETS}  # facet -> value -> ids
+        for record in families:
+            family = record.get('family')
+            if not family or family in self._ids:
+                continue
+            i = len(self.families)
+            category = _category(record.get('category'))
+            subsets = tuple(sys.intern(subset) for subset in record.get('subsets') or ())
+            axes = tuple(tag for tag in record.get('axes') or () if tag)
+            self.families.append(family)
+            self._ids[family] = i
+            self._category.append(sys.intern(category))
+            self._subsets.append(subsets)
+            self._variants.append(tuple(sys.intern(v) for v in record.get('variants') or ()))
+            self._axes.append(axes)
+            self._designer.append(record.get('designer') or '')
+            self._files.append(record.get('files') or None)
+            self._sha256.append(record.get('sha256') or None)
+            if category:
+                values['category'].setdefault(category, []).append(i)
+            for subset in subsets:
+                values['subset'].setdefault(subset, []).append(i)
+            values['type'].setdefault('variable' if axes else 'static', []).append(i)
+            self.search_index.add(family, {'family': family, 'category': category,
+                                           'designer': record.get('designer')})
+        self.search_index.compact()
+        size = len(self.families)
+        self.all = (1 << size) - 1
+        self.facets = {facet: {value: _bitmap(ids, size) for value, ids in facet_values.items()}
+                       for facet, facet_values in values.items()}
+
+    def __len__(self):
+        return len(self.families)
+
+    def index(self, family):
+        return self._ids.get(family)
+
+    def values(self, facet):
+        """(value, number of families) of a facet, by value"""
+        return [(value, bin(bitmap).count('1')) for value, bitmap in sorted(self.facets[facet].items())]
+
+    def select(self, query='', filters=None):
+        """Family numbers matching `query` (ranked) and every facet in `filters` ({facet: value})"""
+        mask = self.all
+        for facet, value in (filters or {}).items():
+            if value is not None:
+                mask &= self.facets[facet].get(value, 0)
+        if query.strip():
+            return [i for i in map(self._ids.__getitem__, self.search_index.search(query)) if mask >> i & 1]
+        return _bit_ids(mask)
+
+    def info(self, i):
+        """Details of family `i`; 'url' / 'sha256' are those of its regular style (or first file)"""
+        files = self._files[i] or {}
+        variant = 'regular' if 'regular' in files else next(iter(files), None)
+        return {
+            'family': self.families[i],
+            'category': self._category[i],
+            'subsets': list(self._subsets[i]),
+            'variants': list(self._variants[i]),
+            'axes': list(self._axes[i]),
+            'designer': self._designer[i],
+            'files': dict(files),
+            'url': files.get(variant),
+            'sha256': (self._sha256[i] or {}).get(variant),
+        }
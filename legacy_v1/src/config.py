@@ -2,6 +2,7 @@ import os
 import sys
 import json
 import locale
+import tempfile
 
 # --- Gestion des ressources PyInstaller ---
 # Quand l'application est compilée avec PyInstaller, les ressources sont
@@ -70,7 +71,13 @@ SETTINGS = {
     "auto_restart": False,
     "language": "System",
     "animated_bg": True,
-    "transparency": "Mica"
+    "transparency": "Mica",
+    "analysis_workers": 0,
+    "analysis_keep_order": False,
+    "analysis_timeout": 30,
+    "scratch_quota_mb": 512,
+    "preview_cache_mb": 32,
+    "google_fonts_catalog": ""
 }
 
 # --- Translations ---
@@ -96,17 +103,18 @@ def load_translations():
 # Load translations on module import
 load_translations()
 
+# Built-in store list, used when no catalog file is found (see GOOGLE_FONTS_CATALOG)
 GOOGLE_FONTS = [
-    {"family": "Roboto", "url": "https://github.com/google/fonts/raw/main/apache/roboto/Roboto-Regular.ttf"},
-    {"family": "Open Sans", "url": "https://github.com/google/fonts/raw/main/apache/opensans/OpenSans-Regular.ttf"},
-    {"family": "Lato", "url": "https://github.com/google/fonts/raw/main/ofl/lato/Lato-Regular.ttf"},
-    {"family": "Montserrat", "url": "https://github.com/google/fonts/raw/main/ofl/montserrat/Montserrat-Regular.ttf"},
-    {"family": "Oswald", "url": "https://github.com/google/fonts/raw/main/ofl/oswald/Oswald-Regular.ttf"},
-    {"family": "Raleway", "url": "https://github.com/google/fonts/raw/main/ofl/raleway/Raleway-Regular.ttf"},
-    {"family": "Poppins", "url": "https://github.com/google/fonts/raw/main/ofl/poppins/Poppins-Regular.ttf"},
-    {"family": "Nunito", "url": "https://github.com/google/fonts/raw/main/ofl/nunito/Nunito-Regular.ttf"},
-    {"family": "Ubuntu", "url": "https://github.com/google/fonts/raw/main/ufl/ubuntu/Ubuntu-Regular.ttf"},
-    {"family": "Playfair Display", "url": "https://github.com/google/fonts/raw/main/ofl/playfairdisplay/PlayfairDisplay-Regular.ttf"},
+    {"family": "Roboto", "category": "sans-serif", "url": "https://github.com/google/fonts/raw/main/apache/roboto/Roboto-Regular.ttf"},
+    {"family": "Open Sans", "category": "sans-serif", "url": "https://github.com/google/fonts/raw/main/apache/opensans/OpenSans-Regular.ttf"},
+    {"family": "Lato", "category": "sans-serif", "url": "https://github.com/google/fonts/raw/main/ofl/lato/Lato-Regular.ttf"},
+    {"family": "Montserrat", "category": "sans-serif", "url": "https://github.com/google/fonts/raw/main/ofl/montserrat/Montserrat-Regular.ttf"},
+    {"family": "Oswald", "category": "sans-serif", "url": "https://github.com/google/fonts/raw/main/ofl/oswald/Oswald-Regular.ttf"},
+    {"family": "Raleway", "category": "sans-serif", "url": "https://github.com/google/fonts/raw/main/ofl/raleway/Raleway-Regular.ttf"},
+    {"family": "Poppins", "category": "sans-serif", "url": "https://github.com/google/fonts/raw/main/ofl/poppins/Poppins-Regular.ttf"},
+    {"family": "Nunito", "category": "sans-serif", "url": "https://github.com/google/fonts/raw/main/ofl/nunito/Nunito-Regular.ttf"},
+    {"family": "Ubuntu", "category": "sans-serif", "url": "https://github.com/google/fonts/raw/main/ufl/ubuntu/Ubuntu-Regular.ttf"},
+    {"family": "Playfair Display", "category": "serif", "url": "https://github.com/google/fonts/raw/main/ofl/playfairdisplay/PlayfairDisplay-Regular.ttf"},
 ]
 
 def tr(key):
@@ -121,6 +129,15 @@ def tr(key):
 # Chemin du fichier de paramètres - utilise APP_DIR pour être à côté de l'exécutable
 # (et non dans _MEIPASS qui est temporaire et supprimé après exécution)
 SETTINGS_FILE = os.path.join(APP_DIR, "settings.json")
+# Cache des métadonnées de polices analysées (SQLite), à côté de settings.json
+FONT_CACHE_FILE = os.path.join(APP_DIR, "font_cache.db")
+# Espace temporaire partagé (polices sorties des archives, téléchargements)
+SCRATCH_DIR = os.path.join(tempfile.gettempdir(), "UltraFontInstaller")
+# Miniatures de prévisualisation (atlas PNG + index), à côté de settings.json
+THUMBNAIL_DIR = os.path.join(APP_DIR, "thumbnails")
+# Catalogue Google Fonts local (JSON de l'API webfonts ou de fonts.google.com),
+# utilisé si le paramètre google_fonts_catalog est vide
+GOOGLE_FONTS_CATALOG = os.path.join(APP_DIR, "google_fonts.json")
 
 def save_settings():
     """Save settings to JSON file"""
@@ -1,17 +1,33 @@
 import os
 import sys
-import json
-import subprocess
 import ctypes
-import urllib.request
 import shutil
-import tempfile
-import zipfile
-from PySide6.QtCore import QThread, Signal
-from PIL import Image, ImageFont, ImageDraw, ImageQt
+import atexit
+import hashlib
+import threading
+import time
+import sqlite3
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from PySide6.QtCore import QObject, QThread, Signal
+from PIL import Image, ImageQt
 from qfluentwidgets import isDarkTheme
 
-from config import BASE_DIR, BIN_DIR, FONT_TOOL, SYSTEM_OPS
+from config import BASE_DIR, BIN_DIR, FONT_CACHE_FILE, SCRATCH_DIR, THUMBNAIL_DIR, SETTINGS
+from analysis import FontInspection, parse_font, render_preview, analyze_job
+from sfnt import file_checksums
+from archive import (
+    is_member_path, normalize_source, source_exists, source_stat, read_source, materialize_member,
+    member_info, archive_font_members
+)
+from font_cache import MetadataCache
+from coverage import CoverageIndex
+from search import SearchIndex
+from catalog import load_catalog, catalog_from_list
+from downloads import ConnectionPool, DownloadError, fetch
+from thumbnails import ThumbnailStore
+import system_ops
 
 # --- System Operations ---
 
@@ -22,47 +38,464 @@ def is_admin():
 def run_as_admin():
     ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, " ".join(sys.argv), None, 1)
 
-def validate_font(file_path):
-    if not os.path.exists(FONT_TOOL):
-        return file_path.lower().endswith(('.ttf', '.otf', '.woff'))
+# --- Font Inspection ---
+# A font is read once per (path, size, mtime); analysis, validation, preview
+# and install all reuse that single result instead of re-reading the file.
+# Results are also persisted in the SQLite metadata cache (font_cache.py) so
+# known fonts are not parsed again in later sessions.
+
+INSPECTION_CACHE_SIZE = 20000
+CACHE_FLUSH_INTERVAL = 500
+PARALLEL_MIN_FILES = 16
+BATCH_MAX_ITEMS = 64
+BATCH_INTERVAL = 0.016
+DOWNLOAD_WORKERS = 4  # concurrent downloads (and pooled connections per host)
+DOWNLOAD_PROGRESS_INTERVAL = 0.1  # seconds between progress signals of one download
+
+_inspections = OrderedDict()
+_inspections_lock = threading.Lock()
+_pending_cache_writes = []
+
+_metadata_cache = None
+_metadata_cache_failed = False
+_metadata_cache_lock = threading.Lock()
+
+def get_metadata_cache():
+    """Shared MetadataCache, or None if the database cannot be opened"""
+    global _metadata_cache, _metadata_cache_failed
+    with _metadata_cache_lock:
+        if _metadata_cache is None and not _metadata_cache_failed:
+            try:
+                _metadata_cache = MetadataCache(FONT_CACHE_FILE)
+            except sqlite3.Error as e:
+                # Read-only install dir or corrupt file: run without the persistent cache
+                print(f"Metadata cache unavailable: {e}")
+                _metadata_cache_failed = True
+        return _metadata_cache
+
+def flush_metadata_cache():
+    """Write inspections gathered since the last flush in one transaction"""
+    with _inspections_lock:
+        pending = list(_pending_cache_writes)
+        _pending_cache_writes.clear()
+    cache = get_metadata_cache()
+    if cache is None or not pending:
+        return 0
     try:
-        result = subprocess.run([FONT_TOOL, "validate", file_path], capture_output=True, creationflags=subprocess.CREATE_NO_WINDOW)
-        return result.returncode == 0
-    except: return False
+        return cache.put_many(pending)
+    except sqlite3.Error as e:
+        print(f"Metadata cache write failed: {e}")
+        return 0
+
+def prune_metadata_cache():
+    """Forget cached fonts whose files were deleted"""
+    cache = get_metadata_cache()
+    if cache is None:
+        return 0
+    try:
+        return cache.evict_missing()
+    except sqlite3.Error as e:
+        print(f"Metadata cache prune failed: {e}")
+        return 0
+
+def _cached_lookup(lookup, *args):
+    cache = get_metadata_cache()
+    if cache is None:
+        return None
+    try:
+        return getattr(cache, lookup)(*args)
+    except sqlite3.Error:
+        # A locked or damaged cache only costs a re-parse
+        return None
+
+def _read_font(path, size, mtime, checksums=None):
+    """Returns (FontInspection, needs_persisting)"""
+    cached = _cached_lookup('get', path, size, mtime)
+    if cached is not None:
+        return _from_cache(path, size, mtime, cached), False
+    inspection, _ = parse_font(path, size, mtime,
+                               lambda content_hash, size: _cached_lookup('get_by_hash', content_hash, size),
+                               checksums=checksums)
+    return inspection, inspection.content_hash is not None
+
+def _from_cache(path, size, mtime, cached):
+    return FontInspection(path, size, mtime, cached.metadata, cached.valid, content_hash=cached.content_hash,
+                          coverage=cached.coverage, crc32=cached.crc32)
+
+def _member_checksum(file_path):
+    """(crc32, size) from the archive directory, or None (tar members carry no CRC)"""
+    info = member_info(file_path)
+    return None if info.crc is None else (info.crc, info.size)
+
+def _inspection_key(file_path):
+    # Works for archive members too: their size from the zip/tar directory, mtime from the archive
+    return (normalize_source(file_path), *source_stat(file_path))
+
+def remember_inspection(inspection, persist=True):
+    """Register a result computed elsewhere (e.g. in a pool worker)"""
+    with _inspections_lock:
+        _inspections[inspection.key] = inspection
+        _inspections.move_to_end(inspection.key)
+        while len(_inspections) > INSPECTION_CACHE_SIZE:
+            _inspections.popitem(last=False)
+        if persist and inspection.content_hash is not None:
+            _pending_cache_writes.append(inspection)
+
+def known_inspection(file_path):
+    """Inspection from memory or the metadata cache, without reading the font"""
+    key = _inspection_key(file_path)
+    with _inspections_lock:
+        inspection = _inspections.get(key)
+    if inspection is None:
+        cached = _cached_lookup('get', *key)
+        persist = False
+        if cached is None and is_member_path(file_path):
+            # A member whose bytes were analysed before, from a file or another archive
+            checksum = _member_checksum(file_path)
+            cached = _cached_lookup('get_by_checksum', *checksum) if checksum else None
+            persist = True
+        if cached is not None:
+            inspection = _from_cache(*key, cached)
+            remember_inspection(inspection, persist)
+    return inspection
+
+def inspect_font(file_path, checksums=None):
+    """Inspect a font file, reusing the previous result if the file is unchanged.
+
+    `checksums` is (content_hash, crc32) if the caller already hashed the file.
+    """
+    key = _inspection_key(file_path)
+    with _inspections_lock:
+        inspection = _inspections.get(key)
+        if inspection is not None:
+            _inspections.move_to_end(key)
+            return inspection
+
+    inspection, persist = _read_font(*key, checksums=checksums)
+    remember_inspection(inspection, persist)
+    return inspection
+
+class ImportIndex:
+    """Fonts already queued on the import page, by normalised path, content hash and (crc32, size)"""
+
+    def __init__(self):
+        self._paths = set()
+        self._hashes = {}
+        self._checksums = {}
+        self._computed = {}     # path -> (content_hash, crc32) hashed by claim_content, for analysis
+        self._lock = threading.Lock()
+
+    def add_path(self, file_path):
+        """Claim a path; False if it is already queued"""
+        key = normalize_source(file_path)
+        with self._lock:
+            if key in self._paths:
+                return False
+            self._paths.add(key)
+            return True
+
+    def claim_content(self, file_path):
+        """Claim a file's bytes; False if the same font already came from another path.
+
+        Zip members are identified by the CRC-32 and size in the zip directory,
+        so no member is decompressed just to be recognised. Other files are
+        hashed here; take_checksums hands the result to analysis.
+        """
+        computed = None
+        try:
+            inspection = known_inspection(file_path)
+            member_checksum = None
+            if inspection is None and is_member_path(file_path):
+                member_checksum = _member_checksum(file_path)
+            if inspection is not None and inspection.content_hash and inspection.crc32 is not None:
+                content_hash, checksum = inspection.content_hash, (inspection.crc32, inspection.size)
+            elif member_checksum:
+                content_hash, checksum = None, member_checksum
+            else:
+                data = read_source(file_path)
+                content_hash, crc32 = computed = file_checksums(file_path if data is None else data)
+                checksum = (crc32, source_stat(file_path)[0])
+        except Exception:
+            # Unreadable: let analysis report the error
+            return True
+        with self._lock:
+            if checksum in self._checksums or (content_hash and content_hash in self._hashes):
+                return False
+            self._checksums[checksum] = file_path
+            if content_hash:
+                self._hashes[content_hash] = file_path
+            if computed is not None:
+                self._computed[file_path] = computed
+            return True
+
+    def take_checksums(self, file_path):
+        """(content_hash, crc32) claim_content computed for a file, once; None if it did not hash it"""
+        with self._lock:
+            return self._computed.pop(file_path, None)
+
+    def clear(self):
+        with self._lock:
+            self._paths.clear()
+            self._hashes.clear()
+            self._checksums.clear()
+            self._computed.clear()
+
+def validate_font(file_path):
+    try: return inspect_font(file_path).valid
+    except OSError: return False
 
 def analyze_font(file_path):
-    if not os.path.exists(FONT_TOOL):
-        return {"name": os.path.basename(file_path), "family": os.path.basename(file_path), "style": "Regular"}
     try:
-        result = subprocess.run([FONT_TOOL, "analyze", file_path], capture_output=True, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-        return {"name": os.path.basename(file_path), "error": "Analysis Error"}
-    except Exception as e:
+        return dict(inspect_font(file_path).metadata)
+    except OSError as e:
         return {"name": os.path.basename(file_path), "error": str(e)}
 
+# --- Installed Font Index ---
+# One directory scan plus the (cached) name tables and cmap coverage of the
+# installed fonts, refreshed only when the Fonts directory's mtime changes.
+# Names also feed a SearchIndex (search.py) for the Library search box; it is
+# brought up to date by LoadLibraryWorker (sync_search), a chunk at a time
+# under its own lock, so typing never waits for a rescan.
+
+FONT_FILE_EXTENSIONS = ('.ttf', '.otf', '.ttc')
+# Metadata fields the name search covers (with the file name)
+SEARCH_FIELDS = ('family', 'name', 'postscript_name', 'style', 'designer', 'manufacturer', 'vendor')
+SEARCH_SYNC_CHUNK = 500  # index changes applied per hold of the search lock
+
+def _name_key(name):
+    return name.casefold().replace(' ', '').replace('-', '') if name else ''
+
+def family_key(name):
+    """Normalized family name, as returned by InstalledFontIndex.families"""
+    return _name_key(name)
+
+class InstalledFontIndex:
+    """O(1) lookups of installed fonts by family, full name, PostScript name, file name or checksums"""
+
+    def __init__(self, fonts_dir=None):
+        self.fonts_dir = fonts_dir or os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts')
+        self._lock = threading.RLock()
+        self._dir_mtime = None
+        self._entries = {}      # path -> (name keys, content hash)
+        self._stamps = {}       # path -> (size, mtime) when inspected
+        self._by_family = {}
+        self._by_name = {}      # family, full, PostScript and file names together
+        self._by_full = {}
+        self._by_postscript = {}
+        self._by_hash = {}
+        self._by_checksum = {}  # (crc32, size)
+        self._coverage = CoverageIndex()
+        self._search = SearchIndex()
+        self._search_lock = threading.Lock()
+        self._search_sync_lock = threading.Lock()
+        self._search_pending = {}  # path -> search fields, or None if removed, until sync_search
+
+    def _link(self, table, key, path):
+        if key:
+            table.setdefault(key, set()).add(path)
+
+    def _unlink(self, table, key, path):
+        paths = table.get(key)
+        if paths is not None:
+            paths.discard(path)
+            if not paths:
+                del table[key]
+
+    def _add(self, path):
+        stem = _name_key(os.path.splitext(os.path.basename(path))[0])
+        family = postscript = full = content_hash = ''
+        checksum = None
+        coverage = b''
+        fields = {'file': os.path.splitext(os.path.basename(path))[0]}
+        try:
+            inspection = inspect_font(path)
+            coverage = inspection.coverage
+            fields.update((field, inspection.metadata.get(field)) for field in SEARCH_FIELDS)
+            family = _name_key(inspection.metadata.get('family'))
+            full = _name_key(inspection.metadata.get('name'))
+            postscript = _name_key(inspection.metadata.get('postscript_name'))
+            content_hash = inspection.content_hash
+            if inspection.crc32 is not None:
+                checksum = (inspection.crc32, inspection.size)
+        except OSError:
+            # Unreadable file: still known by its file name
+            pass
+        names = (stem, family, full, postscript)
+        self._entries[path] = (names, family, full, postscript, content_hash, checksum)
+        for key in names:
+            self._link(self._by_name, key, path)
+        self._link(self._by_family, family, path)
+        self._link(self._by_full, full, path)
+        self._link(self._by_postscript, postscript, path)
+        self._link(self._by_hash, content_hash, path)
+        self._link(self._by_checksum, checksum, path)
+        self._coverage.add(path, coverage)
+        self._search_pending[path] = fields
+
+    def _remove(self, path):
+        names, family, full, postscript, content_hash, checksum = self._entries.pop(path)
+        self._stamps.pop(path, None)
+        for key in names:
+            self._unlink(self._by_name, key, path)
+        self._unlink(self._by_family, family, path)
+        self._unlink(self._by_full, full, path)
+        self._unlink(self._by_postscript, postscript, path)
+        self._unlink(self._by_hash, content_hash, path)
+        self._unlink(self._by_checksum, checksum, path)
+        self._coverage.remove(path)
+        self._search_pending[path] = None
+
+    def refresh(self, force=False):
+        """Rescan the directory if it changed; only new files and files replaced in place are inspected"""
+        with self._lock:
+            try:
+                mtime = os.stat(self.fonts_dir).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime == self._dir_mtime and not force:
+                return
+            current = {}        # path -> (size, mtime)
+            if mtime is not None:
+                try:
+                    with os.scandir(self.fonts_dir) as it:
+                        for entry in it:
+                            if entry.name.lower().endswith(FONT_FILE_EXTENSIONS):
+                                try:
+                                    st = entry.stat()
+                                    current[entry.path] = (st.st_size, st.st_mtime_ns)
+                                except OSError:
+                                    current[entry.path] = None
+                except OSError:
+                    pass
+            for path in set(self._entries) - set(current):
+                self._remove(path)
+            for path, stamp in current.items():
+                if path in self._entries:
+                    if self._stamps.get(path) == stamp:
+                        continue
+                    # Overwritten under the same name: its names and hash are stale
+                    self._remove(path)
+                self._add(path)
+                self._stamps[path] = stamp
+            self._dir_mtime = mtime
+
+    def paths(self):
+        self.refresh()
+        with self._lock:
+            return list(self._entries)
+
+    def covering(self, codepoints):
+        """Paths of the installed fonts whose cmap maps every one of `codepoints`"""
+        self.refresh()
+        with self._lock:
+            return self._coverage.query(codepoints)
+
+    def sync_search(self):
+        """Apply the changes of the last refreshes to the search index (worker threads only)"""
+        with self._search_sync_lock:
+            with self._lock:
+                pending, self._search_pending = self._search_pending, {}
+            changes = list(pending.items())
+            for start in range(0, len(changes), SEARCH_SYNC_CHUNK):
+                with self._search_lock:
+                    for path, fields in changes[start:start + SEARCH_SYNC_CHUNK]:
+                        if fields is None:
+                            self._search.remove(path)
+                        else:
+                            self._search.add(path, fields)
+            # Renumber here rather than in the first search after a rescan
+            with self._search_lock:
+                self._search.compact(force=False)
+
+    def search(self, query, limit=None):
+        """Paths whose names, style, designer or foundry match every word of `query`, best first.
+
+        Covers the fonts as of the last sync_search; never rescans, so it is
+        cheap enough per keystroke.
+        """
+        with self._search_lock:
+            return self._search.search(query, limit)
+
+    def families(self, paths):
+        """Normalized family names (see family_key) of installed font paths"""
+        with self._lock:
+            return {self._entries[path][1] for path in paths if path in self._entries}
+
+    def has_family(self, family):
+        self.refresh()
+        return _name_key(family) in self._by_family
+
+    def has_postscript_name(self, postscript_name):
+        self.refresh()
+        return _name_key(postscript_name) in self._by_postscript
+
+    def content_hashes(self):
+        with self._lock:
+            return set(self._by_hash)
+
+    def has_content_hash(self, content_hash):
+        self.refresh()
+        return bool(content_hash) and content_hash in self._by_hash
+
+    def has_checksum(self, crc32, size):
+        self.refresh()
+        return (crc32, size) in self._by_checksum
+
+    def has_name(self, name):
+        """Match any known name (family, full, PostScript or file name)"""
+        self.refresh()
+        return _name_key(name) in self._by_name
+
+    def contains(self, inspection):
+        """Is this exact face installed: same bytes, or same PostScript/full name"""
+        self.refresh()
+        if inspection.content_hash and inspection.content_hash in self._by_hash:
+            return True
+        postscript = _name_key(inspection.metadata.get('postscript_name'))
+        if postscript and postscript in self._by_postscript:
+            return True
+        full = _name_key(inspection.metadata.get('name'))
+        # Full names only: a Regular face's full name is often its family name
+        return bool(full) and full in self._by_full
+
+_installed_index = None
+_installed_index_lock = threading.Lock()
+
+def installed_font_index():
+    """Shared InstalledFontIndex for the Windows Fonts directory"""
+    global _installed_index
+    with _installed_index_lock:
+        if _installed_index is None:
+            _installed_index = InstalledFontIndex()
+        return _installed_index
+
 def is_font_installed(font_name):
-    """Simple check if font file exists in Fonts directory"""
+    """Check whether a font with this name (family, full, PostScript or file name) is installed"""
     try:
-        fonts_dir = os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts')
-        # Check various possible font file names
-        base_name = font_name.replace(' ', '')
-        possible_names = [
-            font_name,
-            f"{font_name}.ttf",
-            f"{font_name}.otf",
-            f"{base_name}.ttf",
-            f"{base_name}.otf",
-        ]
-
-        for name in possible_names:
-            if os.path.exists(os.path.join(fonts_dir, name)):
-                return True
-        return False
+        return installed_font_index().has_name(font_name)
     except Exception as e:
         # If anything fails, assume not installed
         return False
 
+def is_member_installed(file_path):
+    """Is this archive member installed, judged from the archive directory without decompressing it"""
+    try:
+        checksum = _member_checksum(file_path)
+        if checksum is None:
+            return False
+        if installed_font_index().has_checksum(*checksum):
+            return True
+        cached = _cached_lookup('get_by_checksum', *checksum)
+        return cached is not None and installed_font_index().has_content_hash(cached.content_hash)
+    except Exception as e:
+        return False
+
+def is_inspection_installed(inspection):
+    try:
+        return installed_font_index().contains(inspection)
+    except Exception as e:
+        return False
+
 def get_installed_fonts():
     fonts_dir = os.path.join(os.environ['WINDIR'], 'Fonts')
     fonts = []
@@ -74,132 +507,552 @@ def get_installed_fonts():
     return fonts
 
 def install_font_system(file_path):
-    success = False
-    if os.path.exists(FONT_TOOL):
-        try:
-            res = subprocess.run([FONT_TOOL, "validate", file_path], capture_output=True, creationflags=subprocess.CREATE_NO_WINDOW)
-            if res.returncode == 0: success = True
-        except: pass
+    # Validation comes from the cached inspection (already done by AnalyzeWorker)
+    if not validate_font(file_path):
+        return False
 
-    font_name = os.path.basename(file_path)
-    cmd = ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-File", SYSTEM_OPS, "-Command", "register", "-FontPath", file_path, "-FontName", font_name]
-    try:
-        res = subprocess.run(cmd, capture_output=True, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
-        if "SUCCESS" in res.stdout: success = True
-    except: pass
+    success, _ = system_ops.get_host().request("register", path=file_path, name=os.path.basename(file_path))
     return success
 
+def install_fonts_system(file_paths):
+    """Register many fonts with a single backend process; yields (path, success) as each finishes"""
+    valid = [p for p in file_paths if validate_font(p)]
+    invalid = set(file_paths).difference(valid)
+    for path in file_paths:
+        if path in invalid:
+            yield path, False
+    yield from system_ops.register_fonts([(p, os.path.basename(p)) for p in valid])
+
 def uninstall_font_system(file_name):
-    cmd = ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-File", SYSTEM_OPS, "-Command", "unregister", "-FontPath", file_name]
-    try:
-        res = subprocess.run(cmd, capture_output=True, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
-        return "SUCCESS" in res.stdout
-    except: return False
+    success, _ = system_ops.get_host().request("unregister", path=file_name)
+    return success
 
 def restart_explorer():
-    cmd = ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-File", SYSTEM_OPS, "-Command", "restart-explorer"]
-    subprocess.run(cmd, creationflags=subprocess.CREATE_NO_WINDOW)
+    system_ops.get_host().request("restart-explorer")
+
+def preview_fill():
+    return (255, 255, 255, 255) if isDarkTheme() else (0, 0, 0, 255)
+
+# --- Rendered Preview Cache ---
+# Rendered previews are kept as 8-bit coverage masks (the (size, bytes) pair
+# analyze_job returns) under (font content, text, size), so a card rebuilt, a
+# preview text typed again or a page reloaded reuses the earlier rendering.
+# Colour is applied by pixmap_from_preview, so both themes share one mask.
+
+class PreviewCache:
+    """LRU of rendered previews within a byte budget ("preview_cache_mb" setting)"""
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._previews = OrderedDict()
+        self._lock = threading.Lock()
+
+    def budget(self):
+        if self.max_bytes is not None:
+            return self.max_bytes
+        return SETTINGS.get("preview_cache_mb", 32) * 1024 * 1024
+
+    def get(self, key):
+        with self._lock:
+            preview = self._previews.get(key)
+            if preview is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._previews.move_to_end(key)
+            return preview
+
+    def put(self, key, preview):
+        cost = len(preview[1])
+        with self._lock:
+            old = self._previews.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old[1])
+            budget = self.budget()
+            if cost > budget:
+                return
+            self._previews[key] = preview
+            self.bytes += cost
+            while self.bytes > budget:
+                self.bytes -= len(self._previews.popitem(last=False)[1][1])
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._previews), "bytes": self.bytes, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._previews.clear()
+            self.bytes = 0
+
+preview_cache = PreviewCache()
+
+# The default "Aa" previews are also kept on disk (thumbnails.py), so the
+# Library opens by reading a few PNG atlases instead of rendering every font
+PREVIEW_TEXT = "Aa"
+PREVIEW_SIZE = (300, 64)
+
+_thumbnail_store = None
+_thumbnail_store_lock = threading.Lock()
+
+def thumbnail_store():
+    global _thumbnail_store
+    with _thumbnail_store_lock:
+        if _thumbnail_store is None:
+            _thumbnail_store = ThumbnailStore(THUMBNAIL_DIR)
+            atexit.register(_thumbnail_store.flush)
+        return _thumbnail_store
 
-def create_preview_pixmap(file_path, text="Aa", size=(300, 64)):
+def flush_thumbnails():
+    return thumbnail_store().flush()
+
+def prune_thumbnails():
+    """Forget stored previews of fonts that were deleted or changed since they were rendered"""
+    cache = get_metadata_cache()
+    if cache is None:
+        # Without the cache only installed fonts are known; keep everything
+        return 0
+    flush_metadata_cache()
     try:
-        image = Image.new("RGBA", size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(image)
-        try: font = ImageFont.truetype(file_path, 40)
-        except: font = ImageFont.load_default()
+        live = cache.current_hashes()
+    except sqlite3.Error as e:
+        print(f"Thumbnail prune failed: {e}")
+        return 0
+    live.update(installed_font_index().content_hashes())
+    return thumbnail_store().prune(lambda key: key.split(':', 1)[0] in live)
 
-        bbox = draw.textbbox((0, 0), text, font=font)
-        x = (size[0] - (bbox[2] - bbox[0])) / 2
-        y = (size[1] - (bbox[3] - bbox[1])) / 2 - bbox[1]
+def _thumbnail_key(key):
+    """Disk key for default previews of fonts known by content hash, else None"""
+    font_id, text, size = key
+    if text != PREVIEW_TEXT or not isinstance(font_id[0], str) or len(font_id) != 2:
+        return None
+    return "{}:{}:{}x{}".format(*font_id, *size)
 
-        fill_color = (255, 255, 255, 255) if isDarkTheme() else (0, 0, 0, 255)
-        draw.text((x, y), text, font=font, fill=fill_color)
+def cached_preview(key):
+    """Preview from memory, else from the thumbnail store (promoted to memory)"""
+    preview = preview_cache.get(key)
+    if preview is None:
+        disk_key = _thumbnail_key(key)
+        if disk_key is not None:
+            preview = thumbnail_store().get(disk_key, key[2])
+            if preview is not None:
+                preview_cache.put(key, preview)
+    return preview
 
-        return ImageQt.toqpixmap(image)
-    except: return None
+def store_preview(key, preview):
+    preview_cache.put(key, preview)
+    disk_key = _thumbnail_key(key)
+    if disk_key is not None:
+        thumbnail_store().put(disk_key, preview)
+
+def preview_key(file_path, inspection, text, size):
+    """Same bytes share previews whatever their path; unknown files are keyed by path and mtime"""
+    if inspection is not None and inspection.content_hash:
+        font_id = (inspection.content_hash, inspection.face_index)
+    elif inspection is not None:
+        font_id = inspection.key
+    else:
+        font_id = _inspection_key(file_path)
+    return (font_id, text, tuple(size))
+
+def preview_data(file_path, text=PREVIEW_TEXT, size=PREVIEW_SIZE, inspection=None):
+    """(size, mask bytes) preview from the caches, rendering on a miss; safe off the GUI thread"""
+    if inspection is None:
+        try: inspection = inspect_font(file_path)
+        except OSError: inspection = None
+    key = preview_key(file_path, inspection, text, size)
+    preview = cached_preview(key)
+    if preview is None:
+        image = render_preview(file_path, text, size,
+                               inspection.face_index if inspection else 0,
+                               inspection.valid if inspection else True)
+        preview = (image.size, image.tobytes())
+        store_preview(key, preview)
+    return preview
 
+def create_preview_pixmap(file_path, text=PREVIEW_TEXT, size=PREVIEW_SIZE, inspection=None):
+    try: return pixmap_from_preview(preview_data(file_path, text, size, inspection))
+    except: return None
 
+def pixmap_from_preview(preview, fill=None):
+    """QPixmap of a (size, mask bytes) preview, tinted with `fill` (default: theme text colour)"""
+    if not preview:
+        return None
+    try:
+        size, data = preview
+        image = Image.new("RGBA", size, fill or preview_fill())
+        image.putalpha(Image.frombytes("L", size, data))
+        return ImageQt.toqpixmap(image)
+    except: return None
 
-def extract_archive(file_path):
-    """Extract archive to a temporary directory and return the path"""
+def list_archive_fonts(file_path):
+    """Fonts inside an archive (and archives nested in it), as virtual member paths"""
     try:
-        temp_dir = tempfile.mkdtemp(prefix="font_extract_")
-        shutil.unpack_archive(file_path, temp_dir)
-        return temp_dir
+        return archive_font_members(os.path.abspath(file_path))
     except Exception as e:
-        print(f"Extraction failed: {e}")
-        return None
+        print(f"Archive listing failed: {e}")
+        return []
+
+def materialize_font(file_path):
+    """Real file for a font source; archive members are written to the scratch space once per content"""
+    if not is_member_path(file_path):
+        return file_path
+    inspection = inspect_font(file_path)
+    folder = scratch_space().entry("font", inspection.content_hash or normalize_source(file_path))
+    dest = os.path.join(folder, os.path.basename(file_path))
+    try:
+        if os.path.getsize(dest) == inspection.size:
+            return dest
+    except OSError:
+        pass
+    return materialize_member(file_path, folder)
+
+# --- Scratch Space ---
+# Fonts written out of archives and downloaded files share one folder under
+# %TEMP%, one sub-folder per entry. Entries are found again by key (content
+# hash, URL), and the least recently used are deleted once the folder grows
+# past the "scratch_quota_mb" setting. trim() walks the whole folder, so it
+# runs once per batch (end of an InstallWorker run, DownloadManager going
+# idle), not per entry.
+
+SCRATCH_MIN_AGE = 300  # seconds an entry is protected after its last use
+
+class ScratchSpace:
+    def __init__(self, root=SCRATCH_DIR, quota=None):
+        self.root = root
+        self.quota = quota
+        self._lock = threading.Lock()
+
+    def quota_bytes(self):
+        quota = self.quota if self.quota is not None else SETTINGS.get("scratch_quota_mb", 512)
+        return quota * 1024 * 1024
+
+    def entry(self, kind, key):
+        """Folder for (kind, key), created if needed and marked as just used"""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=12).hexdigest()
+        path = os.path.join(self.root, f"{kind}-{digest}")
+        with self._lock:
+            os.makedirs(path, exist_ok=True)
+            os.utime(path)
+        return path
+
+    def entries(self):
+        """[(path, last_used, size)] of every entry"""
+        result = []
+        try:
+            with os.scandir(self.root) as it:
+                folders = [e for e in it if e.is_dir()]
+        except OSError:
+            return result
+        for folder in folders:
+            size = 0
+            for root, _, files in os.walk(folder.path):
+                for name in files:
+                    try: size += os.path.getsize(os.path.join(root, name))
+                    except OSError: pass
+            try: result.append((folder.path, folder.stat().st_mtime, size))
+            except OSError: pass
+        return result
+
+    def usage(self):
+        return sum(size for _, _, size in self.entries())
+
+    def trim(self):
+        """Delete least recently used entries until usage fits the quota"""
+        with self._lock:
+            entries = sorted(self.entries(), key=lambda e: e[1])
+            total = sum(size for _, _, size in entries)
+            limit = self.quota_bytes()
+            recent = time.time() - SCRATCH_MIN_AGE
+            for path, last_used, size in entries:
+                if total <= limit:
+                    break
+                if last_used > recent:
+                    # Possibly still in use (install or download in progress)
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+            return total
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+_scratch_space = None
+_scratch_space_lock = threading.Lock()
+
+def scratch_space():
+    global _scratch_space
+    with _scratch_space_lock:
+        if _scratch_space is None:
+            _scratch_space = ScratchSpace()
+        return _scratch_space
+
+class SignalBatcher:
+    """Coalesce per-item results from a worker thread into list signals.
+
+    A chunk is emitted once `max_items` are waiting or `interval` seconds
+    have passed since the previous chunk, so the GUI thread handles a few
+    dozen items per event instead of one event per font.
+    """
+
+    def __init__(self, signal, max_items=BATCH_MAX_ITEMS, interval=BATCH_INTERVAL):
+        self.signal = signal
+        self.max_items = max_items
+        self.interval = interval
+        self.items = []
+        self.last_flush = 0.0
+
+    def add(self, item):
+        self.items.append(item)
+        self.poll()
+
+    def poll(self):
+        if len(self.items) >= self.max_items or time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        if self.items:
+            items, self.items = self.items, []
+            self.signal.emit(items)
+        self.last_flush = time.monotonic()
+
+def analysis_worker_count():
+    """Pool size from settings; 0 means one process per core but one"""
+    workers = SETTINGS.get("analysis_workers", 0)
+    if not workers:
+        workers = max(1, (os.cpu_count() or 2) - 1)
+    return workers
+
+def _terminate_pool(executor):
+    """Kill a process pool outright; a stuck worker cannot be interrupted otherwise"""
+    terminate = getattr(executor, 'terminate_workers', None)  # Python 3.14+
+    if terminate is not None:
+        terminate()
+        return
+    for process in list((getattr(executor, '_processes', None) or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
 
 class AnalyzeWorker(QThread):
-    font_analyzed = Signal(object)  # Changed from dict to object for proper Python dict support
+    fonts_analyzed = Signal(object)  # list of font data dicts (see SignalBatcher); object keeps them as Python dicts
 
-    def __init__(self, files):
+    def __init__(self, files, workers=None, keep_order=None, timeout=None, import_index=None):
         super().__init__()
         self.files = files
-
+        self.import_index = import_index
+        self.workers = analysis_worker_count() if workers is None else workers
+        self.keep_order = SETTINGS.get("analysis_keep_order", False) if keep_order is None else keep_order
+        self.timeout = SETTINGS.get("analysis_timeout", 30) if timeout is None else timeout
+        self._ready = {}
+        self._next_index = 0
+        self._batch = None
 
     def run(self):
-        for file_path in self.files:
-            try:
-                # Validate file exists
-                if not os.path.exists(file_path):
-                    continue
+        self._batch = SignalBatcher(self.fonts_analyzed)
+        files = [f for f in self.files if source_exists(f)]
+        if self.workers > 1 and len(files) >= PARALLEL_MIN_FILES:
+            self._run_parallel(files)
+        else:
+            self._run_sequential(files)
+        self._batch.flush()
+        flush_metadata_cache()
+        flush_thumbnails()
 
-                # Analyze font with error handling
+    def _run_sequential(self, files):
+        for index, file_path in enumerate(files, 1):
+            # Persist new results regularly so an interrupted import is not lost
+            if index % CACHE_FLUSH_INTERVAL == 0:
+                flush_metadata_cache()
+            if not self._claim(file_path):
+                continue
+            try:
+                # Read the font once; metadata and validity come from the same pass
+                inspection, error = None, None
                 try:
-                    data = analyze_font(file_path)
+                    inspection = inspect_font(file_path, self._checksums(file_path))
                 except Exception as e:
-                    data = {
-                        'name': os.path.basename(file_path),
-                        'family': os.path.basename(file_path).rsplit('.', 1)[0],
-                        'style': 'Regular',
-                        'error': str(e)
-                    }
-
-                data['path'] = file_path
+                    error = str(e)
 
-                # Validate font
+                # Generate preview with error handling
                 try:
-                    data['valid'] = validate_font(file_path)
+                    preview = preview_data(file_path, inspection=inspection)
                 except Exception as e:
-                    data['valid'] = False
+                    preview = None
 
-                # Check if installed
-                try:
-                    data['installed'] = is_font_installed(data.get('family', os.path.basename(file_path)))
-                except Exception as e:
-                    data['installed'] = False
+                self._batch.add(self._font_data(file_path, inspection, preview, error))
+            except Exception as e:
+                self._batch.add(self._error_data(file_path, str(e)))
+
+    def _run_parallel(self, files):
+        """Spread parse/validate/render over a process pool, streaming results back"""
+        jobs = deque(enumerate(files))
+        # Jobs in flight when a worker died (e.g. FreeType crash): each reruns alone, so only the culprit fails
+        suspects = set()
+        claimed = {}            # index -> checksums from _claim
+        running = {}
+        completed = 0
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            while jobs or running:
+                broken = False
+                # Only `workers` jobs in flight, so a job's deadline starts when it really starts
+                while jobs and len(running) < self.workers:
+                    if any(job[0] in suspects for job in running.values()):
+                        break
+                    if jobs[0][0] in suspects and running:
+                        break
+                    index, path = jobs.popleft()
+                    # Requeued jobs were claimed the first time; claiming again would find their own checksum
+                    if index not in claimed:
+                        if not self._claim(path):
+                            self._deliver(index, None)
+                            continue
+                        claimed[index] = self._checksums(path)
+                    checksums = claimed[index]
+                    try: inspection = known_inspection(path)
+                    except OSError: inspection = None
+                    preview = cached_preview(preview_key(path, inspection, PREVIEW_TEXT, PREVIEW_SIZE)) if inspection else None
+                    if preview is not None:
+                        # Known font already rendered: nothing left for the pool to do
+                        self._deliver(index, self._font_data(path, inspection, preview))
+                        completed += 1
+                        continue
+                    try:
+                        future = executor.submit(analyze_job, path, inspection is None, PREVIEW_TEXT, PREVIEW_SIZE,
+                                                 checksums if inspection is None else None)
+                    except BrokenProcessPool:
+                        # The pool died under an earlier job; this one never ran
+                        jobs.appendleft((index, path))
+                        broken = True
+                        break
+                    running[future] = (index, path, inspection, time.monotonic() + self.timeout)
 
-                data['metadata'] = data
+                done, _ = wait(running, timeout=0.05, return_when=FIRST_COMPLETED)
+                self._batch.poll()
+                lost = []
+                for future in done:
+                    index, path, inspection, _ = running.pop(future)
+                    try:
+                        data = self._job_data(future.result(), path, inspection)
+                    except BrokenProcessPool:
+                        broken = True
+                        if index not in suspects:
+                            lost.append((index, path))
+                            continue
+                        # It ran alone, so it is the one that crashed
+                        data = self._error_data(path, "Analysis crashed")
+                    except Exception as e:
+                        data = self._error_data(path, str(e))
+                    suspects.discard(index)
+                    self._deliver(index, data)
+                    completed += 1
+                    if completed % CACHE_FLUSH_INTERVAL == 0:
+                        flush_metadata_cache()
 
-                # Generate preview with error handling
-                try:
-                    data['preview_pixmap'] = create_preview_pixmap(file_path)
-                except Exception as e:
-                    data['preview_pixmap'] = None
+                now = time.monotonic()
+                expired = [f for f, job in running.items() if job[3] < now]
+                for future in expired:
+                    index, path, _, _ = running.pop(future)
+                    suspects.discard(index)
+                    self._deliver(index, self._error_data(path, "Analysis timed out"))
+                    completed += 1
 
-                self.font_analyzed.emit(data)
+                if expired or broken:
+                    _terminate_pool(executor)
+                    # Jobs that were merely sharing the pool start over, at no cost to them
+                    survivors = lost + [(job[0], job[1]) for job in running.values()]
+                    if broken:
+                        suspects.update(index for index, _ in survivors)
+                    jobs.extendleft(reversed(sorted(survivors)))
+                    running.clear()
+                    executor = ProcessPoolExecutor(max_workers=self.workers)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
-            except Exception as e:
-                # Emit error data if complete analysis fails
-                error_data = {
-                    'path': file_path,
-                    'valid': False,
-                    'installed': False,
-                    'metadata': {
-                        'name': os.path.basename(file_path),
-                        'family': os.path.basename(file_path).rsplit('.', 1)[0] if '.' in os.path.basename(file_path) else os.path.basename(file_path),
-                        'style': 'Unknown',
-                        'error': str(e)
-                    },
-                    'error': str(e),
-                    'preview_pixmap': None
-                }
-                self.font_analyzed.emit(error_data)
+    def _claim(self, file_path):
+        """Skip archive members already installed, and files whose content is already queued"""
+        if is_member_path(file_path) and is_member_installed(file_path):
+            return False
+        return self.import_index is None or self.import_index.claim_content(file_path)
+
+    def _checksums(self, file_path):
+        """Checksums _claim computed, so analysis does not hash the file again"""
+        return None if self.import_index is None else self.import_index.take_checksums(file_path)
+
+    def _deliver(self, index, data):
+        """Emit a result (None = skipped duplicate), in input order if requested"""
+        if not self.keep_order:
+            if data is not None:
+                self._batch.add(data)
+            return
+        self._ready[index] = data
+        while self._next_index in self._ready:
+            data = self._ready.pop(self._next_index)
+            if data is not None:
+                self._batch.add(data)
+            self._next_index += 1
+
+    def _job_data(self, result, path, inspection):
+        if result['inspection'] is not None:
+            inspection = result['inspection']
+            remember_inspection(inspection)
+        if result['preview'] is not None and inspection is not None:
+            store_preview(preview_key(path, inspection, PREVIEW_TEXT, PREVIEW_SIZE), result['preview'])
+        return self._font_data(path, inspection, result['preview'], result['error'])
+
+    def _font_data(self, file_path, inspection, preview, error=None):
+        if inspection is not None:
+            data = dict(inspection.metadata)
+            data['valid'] = inspection.valid
+            data['file_size'] = inspection.size
+        else:
+            data = {
+                'name': os.path.basename(file_path),
+                'family': os.path.basename(file_path).rsplit('.', 1)[0],
+                'style': 'Regular',
+                'error': error,
+                'valid': False
+            }
+
+        data['path'] = file_path
+
+        # Check if installed
+        if inspection is not None:
+            data['installed'] = is_inspection_installed(inspection)
+        else:
+            data['installed'] = is_font_installed(data.get('family', os.path.basename(file_path)))
+
+        data['metadata'] = data
+        # Mask only: the import queue tints it on the GUI thread (see pixmap_from_preview)
+        data['preview'] = preview
+        return data
+
+    def _error_data(self, file_path, error):
+        """Data emitted when analysis of a file fails completely"""
+        name = os.path.basename(file_path)
+        return {
+            'path': file_path,
+            'valid': False,
+            'installed': False,
+            'metadata': {
+                'name': name,
+                'family': name.rsplit('.', 1)[0] if '.' in name else name,
+                'style': 'Unknown',
+                'error': error
+            },
+            'error': error,
+            'preview': None
+        }
 
 class InstallWorker(QThread):
     progress = Signal(int, int, str)
     finished = Signal(int)
     item_updated = Signal(str, bool)
+    item_skipped = Signal(str, str)  # path, locale key of the reason ("already_installed", "duplicate")
 
     def __init__(self, fonts):
         super().__init__()
@@ -208,49 +1061,232 @@ class InstallWorker(QThread):
     def run(self):
         count = 0
         total = len(self.fonts)
+        positions = {}
+        seen_hashes = set()
         for i, font in enumerate(self.fonts):
             if not font['valid'] or font.get('installed', False):
                 continue
-
+            # Re-check against the live index, and skip the same bytes appearing twice in this batch
             try:
-                self.progress.emit(i, total, os.path.basename(font['path']))
-                success = install_font_system(font['path'])
-                self.item_updated.emit(font['path'], success)
+                inspection = inspect_font(font['path'])
+                if is_inspection_installed(inspection):
+                    self.item_skipped.emit(font['path'], "already_installed")
+                    continue
+                if inspection.content_hash in seen_hashes:
+                    self.item_skipped.emit(font['path'], "duplicate")
+                    continue
+                if inspection.content_hash:
+                    seen_hashes.add(inspection.content_hash)
+            except OSError:
+                pass
+            positions.setdefault(font['path'], i)
+
+        # Fonts still inside an archive are written out now, and only these
+        sources = {}
+        reported = set()
+        try:
+            for path in positions:
+                try:
+                    sources[materialize_font(path)] = path
+                except Exception:
+                    reported.add(path)
+                    self.item_updated.emit(path, False)
+
+            # One backend process for the whole batch; results stream back per font
+            for real_path, success in install_fonts_system(list(sources)):
+                path = sources[real_path]
+                reported.add(path)
+                self.progress.emit(positions[path], total, os.path.basename(path))
+                self.item_updated.emit(path, success)
                 if success:
                     count += 1
-            except Exception as e:
-                self.item_updated.emit(font['path'], False)
+        except Exception as e:
+            for path in positions:
+                if path not in reported:
+                    self.item_updated.emit(path, False)
 
+        if any(map(is_member_path, positions)):
+            # Members were written to the scratch space
+            scratch_space().trim()
         self.finished.emit(count)
 
-class DownloadWorker(QThread):
-    finished = Signal(str, str) # url, local_path
+class DownloadManager(QObject):
+    """Every download of the app: at most `workers` at once, over connections pooled per host.
 
-    def __init__(self, url, filename):
-        super().__init__()
-        self.url = url
-        self.filename = filename
+    Files land in the URL's scratch entry, so a transfer interrupted earlier
+    (even in a previous session) resumes from its .part file. Signals are
+    emitted from the download threads and queued to the receivers' thread.
+    """
+    progress = Signal(str, object, object)  # url, bytes received, total bytes (0 = unknown)
+    finished = Signal(str, str)  # url, local_path ("" on failure)
+
+    def __init__(self, workers=DOWNLOAD_WORKERS, parent=None):
+        super().__init__(parent)
+        self.pool = ConnectionPool(per_host=workers)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="download")
+        self._jobs = {}  # url -> cancel event
+        self._lock = threading.Lock()
+
+    def download(self, url, filename, sha256=None):
+        """Queue `url`, saved as `filename`; False if it is already queued"""
+        with self._lock:
+            if url in self._jobs:
+                return False
+            cancel = self._jobs[url] = threading.Event()
+        self._executor.submit(self._run, url, filename, sha256, cancel)
+        return True
+
+    def is_active(self, url):
+        with self._lock:
+            return url in self._jobs
+
+    def cancel(self, url):
+        with self._lock:
+            cancel = self._jobs.get(url)
+        if cancel is not None:
+            cancel.set()
+
+    def shutdown(self):
+        with self._lock:
+            for cancel in self._jobs.values():
+                cancel.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.pool.close()
+
+    def _run(self, url, filename, sha256, cancel):
+        local_path = ""
+        last_emit = 0.0
+
+        def progress(received, total):
+            nonlocal last_emit
+            now = time.monotonic()
+            if now - last_emit >= DOWNLOAD_PROGRESS_INTERVAL or received == total:
+                last_emit = now
+                self.progress.emit(url, received, total)
+
+        try:
+            folder = scratch_space().entry("download", url)
+            local_path = fetch(url, os.path.join(folder, filename), self.pool, sha256, progress, cancel.is_set)
+        except (DownloadError, OSError) as e:
+            print(f"Download failed: {e}")
+        finally:
+            with self._lock:
+                self._jobs.pop(url, None)
+                idle = not self._jobs
+            if idle:
+                # Last download of a batch
+                scratch_space().trim()
+            self.finished.emit(url, local_path)
+
+_download_manager = None
+
+def download_manager():
+    """The app's DownloadManager (first called from the GUI thread, which receives its signals)"""
+    global _download_manager
+    if _download_manager is None:
+        _download_manager = DownloadManager()
+        atexit.register(_download_manager.shutdown)
+    return _download_manager
+
+class CoverageQueryWorker(QThread):
+    """Installed fonts covering a set of code points (the first query may index the Fonts folder)"""
+    results_ready = Signal(object)  # (codepoints, set of paths, set of family keys)
+
+    def __init__(self, codepoints, parent=None):
+        super().__init__(parent)
+        self.codepoints = frozenset(codepoints)
 
     def run(self):
         try:
-            local_path = os.path.join(os.environ['TEMP'], self.filename)
-            urllib.request.urlretrieve(self.url, local_path)
-            self.finished.emit(self.url, local_path)
-        except:
-            self.finished.emit(self.url, "")
+            index = installed_font_index()
+            paths = set(index.covering(self.codepoints))
+            families = index.families(paths)
+        except Exception as e:
+            print(f"Coverage query failed: {e}")
+            paths, families = set(), set()
+        self.results_ready.emit((self.codepoints, paths, families))
 
 class LoadLibraryWorker(QThread):
-    font_found = Signal(str)
+    fonts_found = Signal(object)  # list of paths
+    index_ready = Signal()  # installed_font_index() is up to date: search() covers every font
 
     def run(self):
+        prune_metadata_cache()
         fonts = get_installed_fonts()
+        batch = SignalBatcher(self.fonts_found)
         for font in fonts:
-            self.font_found.emit(font)
+            batch.add(font)
+        batch.flush()
+        # Rows first; new fonts are inspected for the name index afterwards
+        index = installed_font_index()
+        index.refresh()
+        index.sync_search()
+        self.index_ready.emit()
+        # After refresh, so the fonts it just inspected count as live
+        prune_thumbnails()
+
+class PreviewRenderWorker(QThread):
+    """Background preview queue for the Library preview box.
+
+    `submit` replaces the whole queue: jobs of an older request are dropped
+    unrendered, and paths are rendered in the order given (onscreen first).
+    The thread stops when the queue is empty and is restarted by `submit`.
+    """
+    previews_ready = Signal(object)  # list of (path, text, preview) - see pixmap_from_preview
+
+    def __init__(self, size=PREVIEW_SIZE):
+        super().__init__()
+        self.size = size
+        self._jobs = deque()
+        self._text = None
+        self._lock = threading.Lock()
+        self._active = False
+
+    def submit(self, text, paths):
+        with self._lock:
+            self._text = text
+            self._jobs = deque(paths)
+            if self._active:
+                return
+            self._active = True
+        # run() may be returning right now; let it finish before restarting
+        self.wait()
+        self.start()
+
+    def cancel(self):
+        with self._lock:
+            self._jobs.clear()
+
+    def run(self):
+        batch = SignalBatcher(self.previews_ready)
+        while True:
+            with self._lock:
+                if not self._jobs:
+                    self._active = False
+                    break
+                path, text = self._jobs.popleft(), self._text
+            try:
+                preview = preview_data(path, text, self.size)
+            except Exception:
+                preview = None
+            batch.add((path, text, preview))
+        batch.flush()
+
+def load_google_fonts_catalog():
+    """Store catalog: the google_fonts_catalog setting (JSON file or google/fonts checkout),
+    else GOOGLE_FONTS_CATALOG, else the built-in GOOGLE_FONTS list"""
+    from config import GOOGLE_FONTS, GOOGLE_FONTS_CATALOG
+    for source in (SETTINGS.get('google_fonts_catalog'), GOOGLE_FONTS_CATALOG):
+        if source and os.path.exists(source):
+            try:
+                return load_catalog(source)
+            except (OSError, ValueError) as e:
+                print(f"Failed to load catalog {source}: {e}")
+    return catalog_from_list(GOOGLE_FONTS)
 
 class GoogleFontsWorker(QThread):
-    font_found = Signal(dict)
+    """Parses the store catalog once, off the GUI thread"""
+    catalog_loaded = Signal(object)  # catalog.Catalog
 
     def run(self):
-        from config import GOOGLE_FONTS
-        for font in GOOGLE_FONTS:
-            self.font_found.emit(font)
+        self.catalog_loaded.emit(load_google_fonts_catalog())
@@ -0,0 +1,182 @@
+import struct
+import unicodedata
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional: queries fall back to Python integers
+    np = None
+
+# --- Unicode coverage bitsets ---
+# A font's cmap is kept as a sparse bitset: one 256-bit page for every block of
+# 256 code points it maps anything in. The blob (stored in the metadata cache)
+# is a run of (uint32 page number, 32 bytes of bits), sorted by page.
+# CoverageIndex stores the pages of many fonts column-wise, per page number,
+# so "which fonts cover all of this text" is a few bitwise ANDs over the whole
+# library instead of a loop over fonts.
+
+PAGE_BITS = 256
+PAGE_BYTES = PAGE_BITS // 8
+_ENTRY = struct.Struct('<I')
+ENTRY_SIZE = _ENTRY.size + PAGE_BYTES
+
+# Rewrite the columns without removed fonts once they pass this share of the live ones
+COMPACT_RATIO = 0.25
+
+# Characters that need no glyph of their own
+IGNORED_CATEGORIES = ('Cc', 'Cf', 'Zs', 'Zl', 'Zp')
+
+# Letters a font needs to be usable for a script (basic alphabets, both cases)
+SCRIPTS = {
+    'latin': "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz",
+    'vietnamese': (
+        "ĂÂĐÊÔƠƯăâđêôơư"
+        "ÀÁẢÃẠẰẮẲẴẶẦẤẨẪẬÈÉẺẼẸỀẾỂỄỆÌÍỈĨỊÒÓỎÕỌỒỐỔỖỘỜỚỞỠỢÙÚỦŨỤỪỨỬỮỰỲÝỶỸỴ"
+        "àáảãạằắẳẵặầấẩẫậèéẻẽẹềếểễệìíỉĩịòóỏõọồốổỗộờớởỡợùúủũụừứửữựỳýỷỹỵ"
+    ),
+    'greek': "ΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩαβγδεζηθικλμνξοπρςστυφχψω",
+    'cyrillic': "АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯабвгдеёжзийклмнопрстуфхцчшщъыьэюя",
+}
+
+
+def _pages(codepoints):
+    """{page number: int bitmask} of a set of code points"""
+    pages = {}
+    for code in codepoints:
+        page = code >> 8
+        pages[page] = pages.get(page, 0) | 1 << (code & 0xFF)
+    return pages
+
+def encode_coverage(codepoints):
+    """Bitset blob of the code points a cmap maps"""
+    out = bytearray()
+    for page, bits in sorted(_pages(codepoints).items()):
+        out += _ENTRY.pack(page)
+        out += bits.to_bytes(PAGE_BYTES, 'little')
+    return bytes(out)
+
+def iter_pages(blob):
+    """(page number, 32 bytes of bits) of a coverage blob"""
+    for offset in range(0, len(blob) - ENTRY_SIZE + 1, ENTRY_SIZE):
+        yield _ENTRY.unpack_from(blob, offset)[0], blob[offset + _ENTRY.size:offset + ENTRY_SIZE]
+
+def text_codepoints(text):
+    """Code points of `text` a font must map (spaces, controls and line breaks excluded)"""
+    return {ord(c) for c in text if unicodedata.category(c) not in IGNORED_CATEGORIES}
+
+
+class _Page:
+    """Column of one page number: which fonts have it, and their 32 bytes each"""
+
+    def __init__(self):
+        self.ids = array('I')
+        self.bits = bytearray()
+        self.matrix = None  # (ids, uint64 bits) arrays, built on first numpy query
+
+
+class CoverageIndex:
+    """Coverage of many fonts, queried for all fonts at once.
+
+    Fonts get a dense id when added; removing one only clears its `alive`
+    flag, and the columns are rewritten (`compact`) once removed fonts pass
+    COMPACT_RATIO of the live ones. Not thread-safe: the owner serialises
+    access.
+    """
+
+    def __init__(self):
+        self._keys = []         # id -> key
+        self._ids = {}          # key -> id
+        self._alive = bytearray()
+        self._removed = 0
+        self._pages = {}        # page number -> _Page
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, key, blob):
+        if key in self._ids:
+            self.remove(key)
+        font_id = len(self._keys)
+        self._keys.append(key)
+        self._ids[key] = font_id
+        self._alive.append(1)
+        for page, bits in iter_pages(blob or b''):
+            column = self._pages.get(page)
+            if column is None:
+                column = self._pages[page] = _Page()
+            column.ids.append(font_id)
+            column.bits += bits
+            column.matrix = None
+
+    def remove(self, key):
+        font_id = self._ids.pop(key, None)
+        if font_id is not None:
+            self._alive[font_id] = 0
+            self._removed += 1
+            if self._removed > len(self._ids) * COMPACT_RATIO:
+                self.compact()
+
+    def compact(self):
+        """Drop removed fonts from every column and renumber the others"""
+        remap = [None] * len(self._keys)
+        keys = []
+        for font_id, key in enumerate(self._keys):
+            if self._alive[font_id]:
+                remap[font_id] = len(keys)
+                keys.append(key)
+        for page, column in list(self._pages.items()):
+            compacted = _Page()
+            for i, font_id in enumerate(column.ids):
+                new_id = remap[font_id]
+                if new_id is not None:
+                    compacted.ids.append(new_id)
+                    compacted.bits += column.bits[i * PAGE_BYTES:(i + 1) * PAGE_BYTES]
+            if compacted.ids:
+                self._pages[page] = compacted
+            else:
+                del self._pages[page]
+        self._keys = keys
+        self._ids = dict(zip(keys, range(len(keys))))
+        self._alive = bytearray(b'\x01') * len(keys)
+        self._removed = 0
+
+    def query(self, codepoints):
+        """Keys of the fonts that map every one of `codepoints`"""
+        wanted = _pages(codepoints)
+        if not wanted:
+            return list(self._ids)
+        if any(page not in self._pages for page in wanted):
+            return []
+        if np is not None:
+            return self._query_numpy(wanted)
+        return self._query_python(wanted)
+
+    def _query_numpy(self, wanted):
+        covered = np.frombuffer(bytes(self._alive), dtype=np.uint8).astype(bool)
+        # Rarest page first: later ones only narrow down
+        for page, bits in sorted(wanted.items(), key=lambda item: len(self._pages[item[0]].ids)):
+            column = self._pages[page]
+            if column.matrix is None:
+                column.matrix = (np.array(column.ids, dtype=np.uint32),
+                                 np.frombuffer(bytes(column.bits), dtype='<u8').reshape(-1, PAGE_BYTES // 8))
+            ids, matrix = column.matrix
+            query = np.frombuffer(bits.to_bytes(PAGE_BYTES, 'little'), dtype='<u8')
+            has_page = np.zeros(len(covered), dtype=bool)
+            has_page[ids[((matrix & query) == query).all(axis=1)]] = True
+            covered &= has_page
+        return [self._keys[font_id] for font_id in np.flatnonzero(covered)]
+
+    def _query_python(self, wanted):
+        covered = None
+        for page, bits in wanted.items():
+            column = self._pages[page]
+            ids = set()
+            for i, font_id in enumerate(column.ids):
+                page_bits = int.from_bytes(column.bits[i * PAGE_BYTES:(i + 1) * PAGE_BYTES], 'little')
+                if page_bits & bits == bits:
+                    ids.add(font_id)
+            covered = ids if covered is None else covered & ids
+            if not covered:
+                return []
+        return [self._keys[font_id] for font_id in sorted(covered) if self._alive[font_id]]
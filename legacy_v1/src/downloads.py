@@ -0,0 +1,254 @@
+import hashlib
+import http.client
+import os
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+# --- Downloads ---
+# Files are fetched over keep-alive HTTP(S) connections pooled per host. An
+# interrupted transfer leaves `<dest>.part` behind and the next attempt asks
+# only for the missing bytes (Range, guarded by If-Range with the ETag or
+# Last-Modified of the first response). The finished file is checked against
+# the catalog's SHA-256 when there is one. Qt-free: core.DownloadManager runs
+# fetch() on a bounded thread pool and turns progress callbacks into signals.
+
+CHUNK_SIZE = 64 * 1024
+MAX_REDIRECTS = 5
+RETRIES = 3
+RETRY_DELAY = 0.5  # seconds, doubled after each failed attempt
+USER_AGENT = "UltraFontInstaller"
+
+
+class DownloadError(Exception):
+    """Download that retrying will not fix (HTTP error status, bad checksum, too many redirects)"""
+
+
+class DownloadCancelled(DownloadError):
+    pass
+
+
+class ChecksumError(DownloadError):
+    pass
+
+
+class ConnectionPool:
+    """Idle keep-alive connections, at most `per_host` kept per (scheme, host, port).
+
+    `opened` counts the connections ever created, so reuse can be checked.
+    """
+
+    def __init__(self, per_host=4, timeout=30):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.opened = 0
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key):
+        """(connection, reused) for key = (scheme, host, port)"""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+            self.opened += 1
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return connection_class(host, port, timeout=self.timeout), False
+
+    def release(self, key, connection):
+        """Keep a connection whose last response was read to the end"""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        with self._lock:
+            connections = [connection for idle in self._idle.values() for connection in idle]
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def _remove(*paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _validator(response):
+    """What If-Range can compare: a strong ETag, else Last-Modified"""
+    etag = response.getheader('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response.getheader('Last-Modified')
+
+def _read_text(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _request(pool, key, path, headers):
+    """(connection, response) of a GET; a pooled connection the server closed meanwhile is replaced"""
+    while True:
+        connection, reused = pool.acquire(key)
+        try:
+            connection.request('GET', path, headers=headers)
+            return connection, connection.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            connection.close()
+            if not reused:
+                raise
+        except BaseException:
+            connection.close()
+            raise
+
+def _fetch_http(url, partial, pool, progress, cancelled):
+    validator_file = partial + '.validator'
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        path = urllib.parse.urlunsplit(('', '', parts.path or '/', parts.query, ''))
+        headers = {'User-Agent': USER_AGENT, 'Accept-Encoding': 'identity'}
+        offset = _size(partial)
+        if offset:
+            headers['Range'] = f"bytes={offset}-"
+            validator = _read_text(validator_file)
+            if validator:
+                headers['If-Range'] = validator
+        connection, response = _request(pool, key, path, headers)
+        reusable = False
+        try:
+            status = response.status
+            if status in (301, 302, 303, 307, 308):
+                location = response.getheader('Location')
+                response.read()
+                reusable = True
+                if not location:
+                    raise DownloadError(f"HTTP {status} without Location")
+                url = urllib.parse.urljoin(url, location)
+                continue
+            if status == 416 and offset:
+                # Nothing left to send: the partial file is complete
+                response.read()
+                reusable = True
+                return
+            if status == 206 and offset:
+                mode, received = 'ab', offset
+                total = response.getheader('Content-Range', '').rpartition('/')[2]
+                total = int(total) if total.isdigit() else 0
+            elif status == 200:
+                # Full body (first attempt, or the file changed since the partial was written)
+                mode, received = 'wb', 0
+                total = int(response.getheader('Content-Length') or 0)
+                validator = _validator(response)
+                if validator:
+                    with open(validator_file, 'w', encoding='utf-8') as f:
+                        f.write(validator)
+                else:
+                    _remove(validator_file)
+            else:
+                response.read()
+                reusable = True
+                if status >= 500 or status == 429:
+                    raise ConnectionError(f"HTTP {status}")
+                raise DownloadError(f"HTTP {status}")
+            with open(partial, mode) as f:
+                while True:
+                    if cancelled is not None and cancelled():
+                        raise DownloadCancelled(url)
+                    chunk = response.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    received += len(chunk)
+                    if progress is not None:
+                        progress(received, total)
+            if total and received < total:
+                raise ConnectionError("Connection closed before the end of the file")
+            reusable = True
+            return
+        finally:
+            if reusable and not response.will_close:
+                pool.release(key, connection)
+            else:
+                connection.close()
+    raise DownloadError("Too many redirects")
+
+def _copy_file(url, partial, progress, cancelled):
+    """file:// URLs (a local google/fonts checkout)"""
+    source = urllib.request.url2pathname(urllib.parse.urlsplit(url).path)
+    total = os.path.getsize(source)
+    received = 0
+    with open(source, 'rb') as src, open(partial, 'wb') as dst:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+            if cancelled is not None and cancelled():
+                raise DownloadCancelled(url)
+            dst.write(chunk)
+            received += len(chunk)
+            if progress is not None:
+                progress(received, total)
+
+
+def fetch(url, dest, pool, sha256=None, progress=None, cancelled=None, retries=RETRIES):
+    """Download `url` to `dest` and return `dest`.
+
+    A `dest` already there (with the right SHA-256, if given) is kept.
+    `progress(received, total)` is called per chunk (total 0 if unknown);
+    `cancelled()` returning True stops the transfer with DownloadCancelled,
+    keeping the partial file for later. Network errors and 5xx answers are
+    retried, resuming where the previous attempt stopped; DownloadError is
+    raised for the rest. A file with the wrong SHA-256 raises ChecksumError at
+    once, unless it was completed from an earlier partial file: those bytes
+    may be stale, so it is downloaded again from the start.
+    """
+    if os.path.exists(dest) and (not sha256 or _sha256(dest) == sha256.lower()):
+        return dest
+    partial = dest + '.part'
+    local = urllib.parse.urlsplit(url).scheme == 'file'
+    delay = RETRY_DELAY
+    for attempt in range(retries + 1):
+        # file:// copies always start from zero
+        resumed = not local and _size(partial) > 0
+        try:
+            if local:
+                _copy_file(url, partial, progress, cancelled)
+            else:
+                _fetch_http(url, partial, pool, progress, cancelled)
+            if sha256 and _sha256(partial) != sha256.lower():
+                # Never resume from these bytes
+                _remove(partial, partial + '.validator')
+                if not resumed or attempt == retries:
+                    raise ChecksumError(f"SHA-256 mismatch for {url}")
+                continue
+            os.replace(partial, dest)
+            _remove(partial + '.validator')
+            return dest
+        except DownloadError:
+            raise
+        except (OSError, http.client.HTTPException) as e:
+            if attempt == retries:
+                raise DownloadError(f"{url}: {e}") from e
+            time.sleep(delay)
+            delay *= 2
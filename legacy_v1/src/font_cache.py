@@ -0,0 +1,153 @@
+import os
+import json
+import sqlite3
+import threading
+
+from archive import source_exists, split_member_path
+
+# --- Persistent metadata cache ---
+# Stores the result of analysing a font in an SQLite file next to settings.json
+# so that re-importing known fonts does not parse them again.
+# Rows are found either by (path, size, mtime) - no file read at all - or by
+# (content hash, size) when the same font shows up under another path, or by
+# (CRC-32, size) - the checksum zip directories carry - for archive members.
+
+# 2: metadata gained postscript_name
+# 3: crc32 column
+# 4: coverage as bitset pages (coverage.py) instead of ranges
+# 5: metadata gained designer, manufacturer and vendor
+SCHEMA_VERSION = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fonts (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    valid INTEGER NOT NULL,
+    coverage BLOB,
+    crc32 INTEGER
+);
+CREATE INDEX IF NOT EXISTS fonts_by_hash ON fonts (content_hash, size);
+CREATE INDEX IF NOT EXISTS fonts_by_crc ON fonts (crc32, size);
+"""
+
+
+class CachedFont:
+    """One row of the cache"""
+
+    def __init__(self, path, size, mtime, content_hash, metadata, valid, coverage, crc32=None):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.content_hash = content_hash
+        self.metadata = metadata
+        self.valid = valid
+        self.coverage = coverage
+        self.crc32 = crc32
+
+
+class MetadataCache:
+    """SQLite-backed store of analysed fonts, one connection per thread"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._prepare()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _prepare(self):
+        conn = self._connect()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            # Older (or newer) layouts are simply rebuilt; the cache can always be recomputed
+            with conn:
+                conn.execute("DROP TABLE IF EXISTS fonts")
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        else:
+            conn.executescript(_SCHEMA)
+
+    def _row(self, row):
+        if row is None:
+            return None
+        path, size, mtime, content_hash, metadata, valid, coverage, crc32 = row
+        return CachedFont(path, size, mtime, content_hash, json.loads(metadata), bool(valid),
+                          bytes(coverage or b''), crc32)
+
+    def get(self, path, size, mtime):
+        row = self._connect().execute(
+            "SELECT path, size, mtime, content_hash, metadata, valid, coverage, crc32 FROM fonts "
+            "WHERE path = ? AND size = ? AND mtime = ?", (path, size, mtime)).fetchone()
+        return self._row(row)
+
+    def get_by_hash(self, content_hash, size):
+        row = self._connect().execute(
+            "SELECT path, size, mtime, content_hash, metadata, valid, coverage, crc32 FROM fonts "
+            "WHERE content_hash = ? AND size = ? LIMIT 1", (content_hash, size)).fetchone()
+        return self._row(row)
+
+    def get_by_checksum(self, crc32, size):
+        """Match an archive member by its directory entry, before decompressing it"""
+        row = self._connect().execute(
+            "SELECT path, size, mtime, content_hash, metadata, valid, coverage, crc32 FROM fonts "
+            "WHERE crc32 = ? AND size = ? LIMIT 1", (crc32, size)).fetchone()
+        return self._row(row)
+
+    def put_many(self, entries):
+        """Insert or replace many CachedFont entries in a single transaction"""
+        rows = [(e.path, e.size, e.mtime, e.content_hash, json.dumps(e.metadata, ensure_ascii=False),
+                 int(e.valid), e.coverage or None, e.crc32) for e in entries]
+        if not rows:
+            return 0
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO fonts (path, size, mtime, content_hash, metadata, valid, coverage, crc32) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def evict_missing(self):
+        """Drop entries whose file no longer exists; returns how many were removed"""
+        conn = self._connect()
+        # Archive members stay as long as their archive does
+        gone = [(path,) for path, in conn.execute("SELECT path FROM fonts") if not source_exists(path)]
+        if gone:
+            with conn:
+                conn.executemany("DELETE FROM fonts WHERE path = ?", gone)
+        return len(gone)
+
+    def current_hashes(self):
+        """Content hashes of the entries whose file still has the size and mtime they were read at"""
+        hashes = set()
+        for path, size, mtime, content_hash in self._connect().execute(
+                "SELECT path, size, mtime, content_hash FROM fonts"):
+            archive_path, names = split_member_path(path)
+            try:
+                st = os.stat(archive_path)
+            except OSError:
+                continue
+            # Members carry their archive's mtime; their own size needs the directory read
+            if st.st_mtime_ns == mtime and (names or st.st_size == size):
+                hashes.add(content_hash)
+        return hashes
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM fonts")
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
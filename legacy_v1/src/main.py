@@ -1,5 +1,6 @@
 import sys
 import os
+import multiprocessing
 
 from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer
 from PySide6.QtGui import QIcon, QPixmap, QFontDatabase
@@ -343,6 +344,8 @@ class MainWindow(FluentWindow):
         self.setStyleSheet(glass_style)
 
 if __name__ == '__main__':
+    # Required for the analysis process pool in the frozen .exe
+    multiprocessing.freeze_support()
     os.environ["QT_ENABLE_HIGHDPI_SCALING"] = "0"
     os.environ["QT_SCALE_FACTOR"] = "1"
     QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
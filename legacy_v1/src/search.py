@@ -0,0 +1,243 @@
+import unicodedata
+from bisect import bisect_left
+
+# --- Metadata search ---
+# Font names are folded (case, accents, ligature letters) and split into words.
+# Each distinct word is indexed once by its trigrams (and first one and two
+# letters, for short queries); each word knows the fonts using it, per field
+# group. A query token is a few set intersections over the vocabulary, checked
+# word by word, then a union of those words' fonts: typing never tests every
+# name. Results are ranked by where all tokens matched: family first, then the
+# other names, then style / designer / foundry. Groups are evaluated in that
+# order, rarest token first, so a search with a limit stops at the first
+# groups that fill it. Ids are numbered in name order (`compact` renumbers
+# them, and drops removed entries), so ranking a group is sorting integers.
+
+# Field groups, best match first
+FIELD_GROUPS = (
+    ('family',),
+    ('name', 'postscript_name', 'file'),
+    ('style', 'designer', 'manufacturer', 'vendor', 'category'),
+)
+
+# Letters NFKD does not decompose
+_LETTERS = str.maketrans({'æ': 'ae', 'œ': 'oe', 'ø': 'o', 'đ': 'd', 'ð': 'd', 'ł': 'l',
+                          'ı': 'i', 'þ': 'th', 'ħ': 'h', 'ŧ': 't'})
+_ASCII_SPACES = str.maketrans({chr(c): ' ' for c in range(128) if not chr(c).isalnum()})
+_EMPTY = frozenset()
+TOKEN_CACHE_SIZE = 64
+# Renumber once entries added or removed since the last compaction pass this share of the live ones
+COMPACT_RATIO = 0.25
+
+
+def fold(text):
+    """Lowercase, accent-free form of `text` with punctuation as spaces: 'Lékton-Bold' -> 'lekton bold'"""
+    text = text or ''
+    if text.isascii():
+        # Most font names: no accents to strip
+        return text.lower().translate(_ASCII_SPACES)
+    text = unicodedata.normalize('NFKD', text.casefold().translate(_LETTERS))
+    return ''.join(c if c.isalnum() else ' ' for c in text if not unicodedata.combining(c))
+
+def _grams(word):
+    grams = {word[:1], word[:2]}
+    grams.update(word[i:i + 3] for i in range(len(word) - 2))
+    return grams
+
+def _token_grams(token):
+    if len(token) < 3:
+        return (token,)
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class SearchIndex:
+    """Inverted index of font names, queried as the user types.
+
+    `add(key, fields)` takes a dict of field name -> text (see FIELD_GROUPS;
+    other fields are ignored) and replaces any earlier entry for `key`.
+    After a batch of changes, `compact()` does the renumbering the next search
+    would otherwise do. Not thread-safe: the owner serialises access.
+    """
+
+    def __init__(self):
+        self._ids = {}          # key -> id
+        # Per id; ids below _ordered are in name order, later ones were added since.
+        # Removed entries keep a None key until the next compaction.
+        self._keys = []
+        self._sort_keys = []
+        self._doc_words = []    # words per group
+        self._ordered = 0
+        self._removed = 0
+        self._grams = {}        # gram -> set of words
+        self._words = {}        # word -> [set of ids per group]
+        self._postings = {}     # word -> number of (id, group) pairs, to find the rarest token
+        self._token_words = {}  # token -> matching words, until the next change
+        self._group_of = {field: group for group, fields in enumerate(FIELD_GROUPS) for field in fields}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, key):
+        return key in self._ids
+
+    def add(self, key, fields):
+        if key in self._ids:
+            self.remove(key)
+        doc_id = len(self._keys)
+        words = [set() for _ in FIELD_GROUPS]
+        for field, text in fields.items():
+            group = self._group_of.get(field)
+            if group is not None and text:
+                words[group].update(fold(text).split())
+        for group, group_words in enumerate(words):
+            for word in group_words:
+                docs = self._words.get(word)
+                if docs is None:
+                    docs = self._words[word] = [set() for _ in FIELD_GROUPS]
+                    self._postings[word] = 0
+                    for gram in _grams(word):
+                        self._grams.setdefault(gram, set()).add(word)
+                docs[group].add(doc_id)
+                self._postings[word] += 1
+        self._ids[key] = doc_id
+        self._keys.append(key)
+        self._sort_keys.append((fold(fields.get('family')), fold(fields.get('style')), str(key)))
+        self._doc_words.append(words)
+        self._token_words.clear()
+
+    def remove(self, key):
+        doc_id = self._ids.pop(key, None)
+        if doc_id is None:
+            return
+        words = self._doc_words[doc_id]
+        self._keys[doc_id] = self._sort_keys[doc_id] = self._doc_words[doc_id] = None
+        self._removed += 1
+        self._token_words.clear()
+        for group, group_words in enumerate(words):
+            for word in group_words:
+                docs = self._words[word]
+                docs[group].discard(doc_id)
+                self._postings[word] -= 1
+                if not self._postings[word]:
+                    del self._words[word]
+                    del self._postings[word]
+                    for gram in _grams(word):
+                        gram_words = self._grams[gram]
+                        gram_words.discard(word)
+                        if not gram_words:
+                            del self._grams[gram]
+
+    def clear(self):
+        self.__init__()
+
+    def compact(self, force=True):
+        """Renumber the live entries in name order, dropping removed ones.
+
+        Without `force`, only once the entries added or removed since the last
+        compaction pass COMPACT_RATIO of the live ones.
+        """
+        changed = len(self._keys) - self._ordered + self._removed
+        if not changed or (not force and changed <= len(self._ids) * COMPACT_RATIO):
+            return
+        live = sorted(self._ids.values(), key=self._sort_keys.__getitem__)
+        remap = [None] * len(self._keys)
+        for new_id, doc_id in enumerate(live):
+            remap[doc_id] = new_id
+        for docs in self._words.values():
+            for group, ids in enumerate(docs):
+                docs[group] = set(map(remap.__getitem__, ids))
+        self._keys = list(map(self._keys.__getitem__, live))
+        self._sort_keys = list(map(self._sort_keys.__getitem__, live))
+        self._doc_words = list(map(self._doc_words.__getitem__, live))
+        self._ids = dict(zip(self._keys, range(len(live))))
+        self._ordered = len(live)
+        self._removed = 0
+
+    def _matching_words(self, token):
+        """Known words containing `token` (short tokens: starting with it)"""
+        words = self._token_words.get(token)
+        if words is not None:
+            return words
+        # Rarest trigram first: every later intersection only shrinks it
+        found = sorted((self._grams.get(gram, _EMPTY) for gram in _token_grams(token)), key=len)
+        words = found[0]
+        for gram_words in found[1:]:
+            if not words:
+                break
+            words = words & gram_words
+        if len(token) > 3:
+            # Trigrams of a word are unordered: check the survivors
+            words = {word for word in words if token in word}
+        else:
+            words = set(words)
+        if len(self._token_words) >= TOKEN_CACHE_SIZE:
+            # Typing repeats the earlier words of a query: keep the recent ones
+            del self._token_words[next(iter(self._token_words))]
+        self._token_words[token] = words
+        return words
+
+    def _postings_of(self, words, groups):
+        """Posting sets of `words` in `groups`, to union"""
+        word_docs = self._words
+        return [word_docs[word][group] for word in words for group in groups]
+
+    def _filter(self, ids, words, group):
+        """The `ids` using one of `words` in a group up to `group`, checked entry by entry"""
+        doc_words = self._doc_words
+        return {doc_id for doc_id in ids
+                if any(not words.isdisjoint(group_words) for group_words in doc_words[doc_id][:group + 1])}
+
+    def _sorted(self, ids, limit=None):
+        """`ids` in name order (the first `limit`)"""
+        ranked = sorted(ids)
+        if ranked and ranked[-1] >= self._ordered:
+            # Entries added since the last compaction: put them in place by name
+            split = bisect_left(ranked, self._ordered)
+            ranked, added = ranked[:split], ranked[split:]
+            sort_key = self._sort_keys.__getitem__
+            for doc_id in sorted(added, key=sort_key):
+                ranked.insert(bisect_left(ranked, sort_key(doc_id), key=sort_key), doc_id)
+        return ranked if limit is None else ranked[:limit]
+
+    def search(self, query, limit=None):
+        """Keys matching every word of `query`, best first (at most `limit`)"""
+        tokens = []             # matching words per token
+        for token in set(fold(query).split()):
+            words = self._matching_words(token)
+            if not words:
+                return []
+            tokens.append(words)
+        if not tokens:
+            return []
+        self.compact(force=False)
+        # Rarest token first: its entries bound the result, the others only narrow it
+        postings = [sum(map(self._postings.__getitem__, words)) for words in tokens]
+        order = sorted(range(len(tokens)), key=postings.__getitem__)
+        first, others = order[0], order[1:]
+        ranked = []
+        reached = set()         # ids already ranked
+        found = set()           # ids matching the rarest token within the groups so far
+        within = {}             # token -> ids matching it within the groups so far, once unioned
+        for group in range(len(FIELD_GROUPS)):
+            found.update(*self._postings_of(tokens[first], (group,)))
+            tier = found - reached if reached else set(found)
+            for token in others:
+                if not tier:
+                    break
+                words = tokens[token]
+                if token not in within and len(tier) * (group + 1) * 16 < postings[token]:
+                    # Few entries left: checking them (~16x the cost of a posting) beats unioning a common token's postings
+                    tier = self._filter(tier, words, group)
+                    continue
+                token_ids = within.setdefault(token, set())
+                token_ids.update(*self._postings_of(words, (group,) if token_ids else range(group + 1)))
+                tier &= token_ids
+            if not tier:
+                continue
+            if group + 1 < len(FIELD_GROUPS):
+                reached |= tier
+            wanted = None if limit is None else limit - len(ranked)
+            ranked.extend(self._sorted(tier, wanted))
+            if wanted is not None and wanted <= len(tier):
+                break
+        return list(map(self._keys.__getitem__, ranked))
@@ -0,0 +1,492 @@
+import os
+import mmap
+import hashlib
+import struct
+import zlib
+
+# --- In-process sfnt reader ---
+# Reads TrueType/OpenType/TTC/WOFF files without spawning font_tool.exe.
+# The table directory is read on first access and each table is decoded only
+# when asked for, so looking up a family name never touches the glyph data.
+
+SFNT_VERSIONS = (b'\x00\x01\x00\x00', b'OTTO', b'true', b'typ1')
+HEAD_MAGIC = 0x5F0F3CF5
+REQUIRED_TABLES = ('head', 'hhea', 'maxp', 'cmap')
+
+NAME_FAMILY = 1
+NAME_SUBFAMILY = 2
+NAME_FULL_NAME = 4
+NAME_VERSION = 5
+NAME_POSTSCRIPT = 6
+NAME_MANUFACTURER = 8
+NAME_DESIGNER = 9
+
+
+class SfntError(Exception):
+    """Raised when a file is not a readable sfnt font"""
+
+
+class SfntReader:
+    """Lazy, memory-mapped reader for a single face of an sfnt file.
+
+    `source` is either a file path or the raw bytes of the file
+    (e.g. an archive member). Use as a context manager so the mapping
+    is released promptly - Windows keeps the file locked while mapped.
+    """
+
+    def __init__(self, source, face_index=0):
+        self.face_index = face_index
+        self._file = None
+        self._map = None
+        self._tables = None
+        self._woff = False
+        self._cache = {}
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.path = None
+            self._data = memoryview(source)
+        else:
+            self.path = source
+            self._file = open(source, 'rb')
+            try:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                self.close()
+                raise SfntError("Empty file")
+            self._data = memoryview(self._map)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._cache.clear()
+        if self._data is not None and self._map is not None:
+            self._data.release()
+        self._data = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # --- Table directory ---
+
+    def _unpack(self, fmt, offset):
+        try:
+            return struct.unpack_from(fmt, self._data, offset)
+        except struct.error:
+            raise SfntError("Truncated file")
+
+    def _read_directory(self):
+        signature = bytes(self._data[:4])
+        offset = 0
+
+        if signature == b'ttcf':
+            num_fonts, = self._unpack('>I', 8)
+            if not 0 <= self.face_index < num_fonts:
+                raise SfntError(f"Face index {self.face_index} out of range")
+            offset, = self._unpack('>I', 12 + 4 * self.face_index)
+            signature = bytes(self._data[offset:offset + 4])
+        elif self.face_index != 0:
+            raise SfntError(f"Face index {self.face_index} out of range")
+
+        tables = {}
+        if signature == b'wOFF':
+            self._woff = True
+            num_tables, = self._unpack('>H', 12)
+            for i in range(num_tables):
+                tag, table_offset, comp_length, orig_length, _ = self._unpack('>4sIIII', 44 + 20 * i)
+                tables[tag.decode('latin-1')] = (table_offset, comp_length, orig_length)
+        elif signature in SFNT_VERSIONS:
+            num_tables, = self._unpack('>H', offset + 4)
+            for i in range(num_tables):
+                tag, _, table_offset, length = self._unpack('>4sIII', offset + 12 + 16 * i)
+                tables[tag.decode('latin-1')] = (table_offset, length, length)
+        elif signature == b'wOF2':
+            raise SfntError("WOFF2 is not supported")
+        else:
+            raise SfntError("Unknown font signature")
+
+        size = len(self._data)
+        for tag, (table_offset, stored_length, _) in tables.items():
+            if table_offset + stored_length > size:
+                raise SfntError(f"Table '{tag}' extends past end of file")
+        self._tables = tables
+
+    @property
+    def tables(self):
+        if self._tables is None:
+            self._read_directory()
+        return self._tables
+
+    def has_table(self, tag):
+        return tag in self.tables
+
+    def table(self, tag):
+        """Return the raw bytes of a table, or None if the font has none"""
+        entry = self.tables.get(tag)
+        if entry is None:
+            return None
+        table_offset, stored_length, orig_length = entry
+        raw = self._data[table_offset:table_offset + stored_length]
+        try:
+            if self._woff and stored_length < orig_length:
+                try:
+                    return zlib.decompress(raw)
+                except zlib.error:
+                    raise SfntError(f"Corrupt compressed table '{tag}'")
+            return bytes(raw)
+        finally:
+            # A traceback still holding the slice would keep close() from unmapping the file
+            raw.release()
+
+    def _decoded(self, tag, decoder):
+        if tag not in self._cache:
+            data = self.table(tag)
+            self._cache[tag] = decoder(data) if data is not None else None
+        return self._cache[tag]
+
+    # --- Decoded tables ---
+
+    @property
+    def head(self):
+        return self._decoded('head', _decode_head)
+
+    @property
+    def hhea(self):
+        return self._decoded('hhea', _decode_hhea)
+
+    @property
+    def maxp(self):
+        return self._decoded('maxp', _decode_maxp)
+
+    @property
+    def os2(self):
+        return self._decoded('OS/2', _decode_os2)
+
+    @property
+    def names(self):
+        return self._decoded('name', _decode_name)
+
+    @property
+    def cmap(self):
+        return self._decoded('cmap', _decode_cmap)
+
+    @property
+    def advances(self):
+        """Advance width of every glyph in font units ('hmtx')"""
+        if 'hmtx' not in self._cache:
+            data, hhea, maxp = self.table('hmtx'), self.hhea, self.maxp
+            self._cache['hmtx'] = (_decode_hmtx(data, hhea['num_hmetrics'], maxp['num_glyphs'])
+                                   if data is not None and hhea and maxp else None)
+        return self._cache['hmtx']
+
+    @property
+    def kerning(self):
+        """{(left glyph, right glyph): value} from the 'kern' table (empty if none)"""
+        return self._decoded('kern', _decode_kern) or {}
+
+    def content_hash(self):
+        """Digest of the whole file, used to recognise the same font under another path"""
+        return hashlib.blake2b(self._data, digest_size=16).hexdigest()
+
+    def crc32(self):
+        """CRC-32 of the whole file, as stored in zip directories"""
+        return zlib.crc32(self._data) & 0xffffffff
+
+    def name(self, name_id, default=None):
+        return self.names.get(name_id, default) if self.names else default
+
+    # --- High level ---
+
+    def validate(self):
+        """Raise SfntError if the face is not usable as an installable font"""
+        for tag in REQUIRED_TABLES:
+            if not self.has_table(tag):
+                raise SfntError(f"Missing required table '{tag}'")
+        if self.head['magic'] != HEAD_MAGIC:
+            raise SfntError("Bad 'head' magic number")
+        if not self.has_table('glyf') and not self.has_table('CFF ') and not self.has_table('CFF2'):
+            raise SfntError("No glyph outlines")
+        if self.maxp['num_glyphs'] == 0:
+            raise SfntError("Font has no glyphs")
+
+    def metadata(self):
+        """Same fields font_tool.exe prints for `analyze`, plus PostScript name, designer and foundry"""
+        family = self.name(NAME_FAMILY, "Unknown")
+        try:
+            os2 = self.os2
+        except SfntError:
+            # Vendor ID is optional here; a short OS/2 table is validate()'s business
+            os2 = None
+        ext = os.path.splitext(self.path or '')[1].lower()
+        return {
+            "name": self.name(NAME_FULL_NAME, family),
+            "family": family,
+            "style": self.name(NAME_SUBFAMILY, "Regular"),
+            "version": self.name(NAME_VERSION, "1.0"),
+            "postscript_name": self.name(NAME_POSTSCRIPT, ""),
+            "designer": self.name(NAME_DESIGNER, ""),
+            "manufacturer": self.name(NAME_MANUFACTURER, ""),
+            "vendor": os2['vendor'] if os2 else "",
+            "format": {".ttf": "TrueType", ".otf": "OpenType"}.get(ext, "Unknown"),
+        }
+
+
+def file_checksums(source, chunk_size=1 << 20):
+    """(content_hash, crc32) as SfntReader computes them, streaming the file (or over bytes)"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.blake2b(source, digest_size=16).hexdigest(), zlib.crc32(source) & 0xffffffff
+    digest = hashlib.blake2b(digest_size=16)
+    crc = 0
+    with open(source, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+    return digest.hexdigest(), crc & 0xffffffff
+
+
+# --- Table decoders ---
+
+def _decode_head(data):
+    if len(data) < 54:
+        raise SfntError("Truncated 'head' table")
+    (_, font_revision, _, magic, flags, units_per_em, _, _,
+     x_min, y_min, x_max, y_max, mac_style, _, _, index_to_loc, _) = struct.unpack_from('>IiIIHHqqhhhhHHhhh', data)
+    return {
+        'font_revision': font_revision / 65536.0,
+        'magic': magic,
+        'flags': flags,
+        'units_per_em': units_per_em,
+        'bbox': (x_min, y_min, x_max, y_max),
+        'mac_style': mac_style,
+        'index_to_loc_format': index_to_loc,
+    }
+
+
+def _decode_hhea(data):
+    if len(data) < 36:
+        raise SfntError("Truncated 'hhea' table")
+    fields = struct.unpack_from('>Ihhh', data)
+    num_hmetrics, = struct.unpack_from('>H', data, 34)
+    return {
+        'ascender': fields[1],
+        'descender': fields[2],
+        'line_gap': fields[3],
+        'num_hmetrics': num_hmetrics,
+    }
+
+
+def _decode_hmtx(data, num_hmetrics, num_glyphs):
+    if num_hmetrics == 0 or len(data) < num_hmetrics * 4:
+        raise SfntError("Truncated 'hmtx' table")
+    advances = list(struct.unpack_from(f'>{num_hmetrics * 2}H', data)[0::2])
+    # Glyphs past numberOfHMetrics share the last advance
+    advances.extend([advances[-1]] * max(0, num_glyphs - num_hmetrics))
+    return advances
+
+
+def _decode_kern(data):
+    """Horizontal format 0 subtables of a Windows (version 0) 'kern' table"""
+    pairs = {}
+    if len(data) < 4:
+        return pairs
+    version, num_tables = struct.unpack_from('>HH', data)
+    if version != 0:
+        # Apple 'kern' (version 1.0): FreeType's basic layout ignores it too
+        return pairs
+    offset = 4
+    for _ in range(num_tables):
+        if offset + 6 > len(data):
+            break
+        _, length, coverage = struct.unpack_from('>HHH', data, offset)
+        # Bits: 0 horizontal, 1 minimum, 2 cross-stream, 3 override; high byte = format
+        if coverage >> 8 == 0 and coverage & 0x7 == 1 and offset + 14 <= len(data):
+            num_pairs, = struct.unpack_from('>H', data, offset + 6)
+            start = offset + 14
+            count = min(num_pairs, (len(data) - start) // 6)
+            values = struct.unpack_from(f'>{count * 3}H', data, start)
+            override = bool(coverage & 0x8)
+            for i in range(0, count * 3, 3):
+                key = (values[i], values[i + 1])
+                value = values[i + 2] - 0x10000 if values[i + 2] >= 0x8000 else values[i + 2]
+                pairs[key] = value if override else pairs.get(key, 0) + value
+        if length < 6:
+            break
+        offset += length
+    return pairs
+
+
+def _decode_maxp(data):
+    if len(data) < 6:
+        raise SfntError("Truncated 'maxp' table")
+    version, num_glyphs = struct.unpack_from('>IH', data)
+    return {'version': version, 'num_glyphs': num_glyphs}
+
+
+def _decode_os2(data):
+    if len(data) < 78:
+        raise SfntError("Truncated 'OS/2' table")
+    version, avg_width, weight_class, width_class, fs_type = struct.unpack_from('>HhHHH', data)
+    family_class, = struct.unpack_from('>h', data, 30)
+    panose = bytes(data[32:42])
+    unicode_ranges = struct.unpack_from('>IIII', data, 42)
+    vendor = bytes(data[58:62]).decode('latin-1').strip()
+    fs_selection, first_char, last_char = struct.unpack_from('>HHH', data, 62)
+    return {
+        'version': version,
+        'avg_char_width': avg_width,
+        'weight_class': weight_class,
+        'width_class': width_class,
+        'fs_type': fs_type,
+        'family_class': family_class,
+        'panose': panose,
+        'unicode_ranges': unicode_ranges,
+        'vendor': vendor,
+        'fs_selection': fs_selection,
+        'first_char': first_char,
+        'last_char': last_char,
+    }
+
+
+def _name_priority(platform_id, encoding_id, language_id):
+    # Windows English first, then any Unicode record, then Mac Roman
+    if platform_id == 3 and encoding_id in (1, 10):
+        return 0 if language_id == 0x409 else 1
+    if platform_id == 0:
+        return 2
+    if platform_id == 1 and encoding_id == 0:
+        return 3 if language_id == 0 else 4
+    return None
+
+
+def _decode_name(data):
+    if len(data) < 6:
+        raise SfntError("Truncated 'name' table")
+    _, count, string_offset = struct.unpack_from('>HHH', data)
+    best = {}
+    for i in range(count):
+        record = 6 + 12 * i
+        if record + 12 > len(data):
+            break
+        platform_id, encoding_id, language_id, name_id, length, offset = struct.unpack_from('>HHHHHH', data, record)
+        priority = _name_priority(platform_id, encoding_id, language_id)
+        if priority is None or (name_id in best and best[name_id][0] <= priority):
+            continue
+        start = string_offset + offset
+        raw = bytes(data[start:start + length])
+        try:
+            text = raw.decode('mac_roman' if platform_id == 1 else 'utf-16-be')
+        except UnicodeDecodeError:
+            continue
+        text = text.strip('\x00').strip()
+        if text:
+            best[name_id] = (priority, text)
+    return {name_id: text for name_id, (_, text) in best.items()}
+
+
+def _decode_cmap(data):
+    """Map code points to glyph ids from the best Unicode subtable"""
+    if len(data) < 4:
+        raise SfntError("Truncated 'cmap' table")
+    _, num_subtables = struct.unpack_from('>HH', data)
+    candidates = []
+    for i in range(num_subtables):
+        if 4 + 8 * i + 8 > len(data):
+            break
+        platform_id, encoding_id, offset = struct.unpack_from('>HHI', data, 4 + 8 * i)
+        if offset + 2 > len(data):
+            continue
+        fmt, = struct.unpack_from('>H', data, offset)
+        if platform_id == 3 and encoding_id == 10 or platform_id == 0 and encoding_id in (4, 6):
+            rank = 0
+        elif platform_id == 3 and encoding_id == 1 or platform_id == 0:
+            rank = 1
+        elif platform_id == 3 and encoding_id == 0:
+            rank = 2
+        else:
+            continue
+        candidates.append((rank, fmt, offset))
+
+    for _, fmt, offset in sorted(candidates, key=lambda c: (c[0], -c[1])):
+        decoder = _CMAP_FORMATS.get(fmt)
+        if decoder:
+            try:
+                return decoder(data, offset)
+            except struct.error:
+                continue
+    return {}
+
+
+def _cmap_format0(data, offset):
+    glyphs = data[offset + 6:offset + 262]
+    return {code: gid for code, gid in enumerate(glyphs) if gid}
+
+
+def _cmap_format4(data, offset):
+    seg_count = struct.unpack_from('>H', data, offset + 6)[0] // 2
+    ends = struct.unpack_from(f'>{seg_count}H', data, offset + 14)
+    starts_at = offset + 16 + 2 * seg_count
+    starts = struct.unpack_from(f'>{seg_count}H', data, starts_at)
+    deltas = struct.unpack_from(f'>{seg_count}h', data, starts_at + 2 * seg_count)
+    range_offsets_at = starts_at + 4 * seg_count
+    range_offsets = struct.unpack_from(f'>{seg_count}H', data, range_offsets_at)
+
+    mapping = {}
+    for seg in range(seg_count):
+        start, end, delta, range_offset = starts[seg], ends[seg], deltas[seg], range_offsets[seg]
+        if start == 0xFFFF:
+            continue
+        if range_offset == 0:
+            for code in range(start, end + 1):
+                gid = (code + delta) & 0xFFFF
+                if gid:
+                    mapping[code] = gid
+        else:
+            base = range_offsets_at + 2 * seg + range_offset
+            for code in range(start, end + 1):
+                at = base + 2 * (code - start)
+                if at + 2 > len(data):
+                    break
+                gid, = struct.unpack_from('>H', data, at)
+                if gid:
+                    gid = (gid + delta) & 0xFFFF
+                    if gid:
+                        mapping[code] = gid
+    return mapping
+
+
+def _cmap_format6(data, offset):
+    first, count = struct.unpack_from('>HH', data, offset + 6)
+    glyphs = struct.unpack_from(f'>{count}H', data, offset + 10)
+    return {first + i: gid for i, gid in enumerate(glyphs) if gid}
+
+
+def _cmap_format12(data, offset):
+    num_groups, = struct.unpack_from('>I', data, offset + 12)
+    mapping = {}
+    for i in range(num_groups):
+        start, end, start_gid = struct.unpack_from('>III', data, offset + 16 + 12 * i)
+        if end - start > 0x10FFFF:
+            raise SfntError("Bad cmap group")
+        for code in range(start, end + 1):
+            mapping[code] = start_gid + code - start
+    return mapping
+
+
+_CMAP_FORMATS = {
+    0: _cmap_format0,
+    4: _cmap_format4,
+    6: _cmap_format6,
+    12: _cmap_format12,
+}
+
+
+def decode_cmap_table(data):
+    """Code point -> glyph id map of a raw 'cmap' table, e.g. from QRawFont.fontTable"""
+    return _decode_cmap(bytes(data))
@@ -0,0 +1,217 @@
+import os
+import abc
+import json
+import time
+import queue
+import shlex
+import atexit
+import threading
+import subprocess
+import tempfile
+
+from config import SYSTEM_OPS
+
+# --- System operations backend ---
+# Font registration goes through SystemOps.ps1. The backend object only knows
+# how to build the command line, so a stand-in script speaking the same
+# arguments and output (see sysops_standin.py) can replace PowerShell, e.g.
+# on Linux: UFI_SYSTEM_OPS="python sysops_standin.py"
+
+# CREATE_NO_WINDOW only exists on Windows
+NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+
+class SystemOpsBackend(abc.ABC):
+    """Base backend: subclasses provide the command prefix"""
+
+    @abc.abstractmethod
+    def command(self, *args):
+        """Full argv running one SystemOps.ps1 operation"""
+
+    def run(self, *args):
+        """Run one operation and return its stdout ('' on failure to launch)"""
+        try:
+            res = subprocess.run(self.command(*args), capture_output=True, text=True,
+                                 errors='replace', creationflags=NO_WINDOW)
+            return res.stdout
+        except OSError:
+            return ""
+
+    def stream(self, *args):
+        """Start an operation and yield its stdout line by line as it runs"""
+        process = subprocess.Popen(self.command(*args), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                   text=True, errors='replace', bufsize=1, creationflags=NO_WINDOW)
+        try:
+            for line in process.stdout:
+                yield line.rstrip('\r\n')
+        finally:
+            process.stdout.close()
+            process.wait()
+
+
+class PowerShellBackend(SystemOpsBackend):
+    def __init__(self, script=SYSTEM_OPS):
+        self.script = script
+
+    def command(self, *args):
+        return ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-File", self.script, *args]
+
+
+class ScriptBackend(SystemOpsBackend):
+    """Any executable accepting the SystemOps.ps1 arguments"""
+
+    def __init__(self, argv):
+        self.argv = list(argv)
+
+    def command(self, *args):
+        return [*self.argv, *args]
+
+
+_backend = None
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        override = os.environ.get('UFI_SYSTEM_OPS')
+        _backend = ScriptBackend(shlex.split(override)) if override else PowerShellBackend()
+    return _backend
+
+
+def _run_batch(command, items, backend):
+    """Send a manifest of items to one backend call; yields (index, success, message)"""
+    fd, manifest = tempfile.mkstemp(prefix="ufi_manifest_", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False)
+        seen = set()
+        try:
+            for line in (backend or get_backend()).stream("-Command", command, "-Manifest", manifest):
+                try:
+                    result = json.loads(line)
+                    index = int(result['id'])
+                except (ValueError, KeyError, TypeError):
+                    # Anything else on stdout is just noise
+                    continue
+                if 0 <= index < len(items) and index not in seen:
+                    seen.add(index)
+                    yield index, result.get('status') == "SUCCESS", result.get('message', "")
+        except OSError:
+            # Backend could not be started
+            pass
+        # Items the backend never answered for (crash, killed) count as failures
+        for index in range(len(items)):
+            if index not in seen:
+                yield index, False, "No result"
+    finally:
+        try: os.remove(manifest)
+        except OSError: pass
+
+
+def register_fonts(fonts, backend=None):
+    """Register many (path, name) pairs with one backend process, streaming (path, success)"""
+    items = [{"path": path, "name": name} for path, name in fonts]
+    for index, success, _ in _run_batch("register-batch", items, backend):
+        yield items[index]["path"], success
+
+
+# --- Persistent host ---
+# One backend process started with "-Command serve" stays alive and takes
+# JSON-line requests on stdin, so single installs/uninstalls pay no process
+# start-up. If the process dies it is started again on the next request.
+
+HOST_TIMEOUT = 60
+
+
+class SystemOpsHost:
+    def __init__(self, backend=None, timeout=HOST_TIMEOUT):
+        self.backend = backend
+        self.timeout = timeout
+        self._process = None
+        self._lines = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _start(self):
+        backend = self.backend or get_backend()
+        self._process = subprocess.Popen(backend.command("-Command", "serve"), stdin=subprocess.PIPE,
+                                         stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+                                         errors='replace', bufsize=1, creationflags=NO_WINDOW)
+        self._lines = queue.Queue()
+        # Reader thread so a hung host can be detected with a timeout
+        threading.Thread(target=self._read, args=(self._process, self._lines), daemon=True).start()
+
+    @staticmethod
+    def _read(process, lines):
+        for line in process.stdout:
+            lines.put(line)
+        lines.put(None)  # EOF: host exited
+
+    def _stop(self):
+        if self._process is not None:
+            try:
+                self._process.kill()
+                self._process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        self._process = None
+
+    def _send(self, request):
+        if self._process is None or self._process.poll() is not None:
+            self._stop()
+            self._start()
+        self._process.stdin.write(json.dumps(request) + "\n")
+        self._process.stdin.flush()
+        deadline = time.monotonic() + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("System operation timed out")
+            line = self._lines.get(timeout=remaining)
+            if line is None:
+                raise BrokenPipeError("System operations host exited")
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(result, dict) and result.get('id') == request['id']:
+                return result
+
+    def request(self, op, **params):
+        """Run one operation in the host; returns (success, message)"""
+        with self._lock:
+            # One retry: register/unregister are idempotent, so re-sending after a crash is safe
+            for attempt in range(2):
+                self._next_id += 1
+                try:
+                    result = self._send({"id": self._next_id, "op": op, **params})
+                    return result.get('status') == "SUCCESS", result.get('message', "")
+                except (OSError, ValueError, queue.Empty, TimeoutError) as e:
+                    self._stop()
+                    message = str(e) or type(e).__name__
+                    if isinstance(e, (TimeoutError, queue.Empty)):
+                        # A hung operation is not retried
+                        break
+            return False, message
+
+    def close(self):
+        with self._lock:
+            if self._process is not None:
+                try:
+                    self._process.stdin.close()
+                    self._process.wait(timeout=5)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+            self._stop()
+
+
+_host = None
+_host_lock = threading.Lock()
+
+def get_host():
+    """Shared SystemOpsHost, closed when the application exits"""
+    global _host
+    with _host_lock:
+        if _host is None:
+            _host = SystemOpsHost()
+            atexit.register(_host.close)
+        return _host
@@ -0,0 +1,211 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from PIL import Image
+
+# --- On-disk thumbnail store ---
+# Rendered preview masks packed into 8-bit PNG atlases (a grid of same-sized slots) with
+# one JSON index mapping each key to (atlas, slot). Opening the Library then
+# costs one PNG decode per atlas instead of one FreeType render per font.
+# Keys carry the font's content hash, so a changed font simply misses; prune()
+# frees the slots of fonts that were removed or changed.
+
+# 2: masks instead of RGBA
+INDEX_VERSION = 2
+ATLAS_COLUMNS = 4
+ATLAS_ROWS = 16
+LOADED_ATLASES = 2
+FLUSH_BATCH = 64
+
+
+def _save_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+class ThumbnailStore:
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.RLock()
+        self._entries = {}      # key -> (atlas name, slot)
+        self._counts = {}       # atlas name -> used slots
+        self._pending = {}      # key -> ((w, h), mask bytes) not yet written
+        self._loaded = OrderedDict()  # atlas name -> decoded RGBA image
+        self._read_index()
+
+    @property
+    def index_path(self):
+        return os.path.join(self.root, "index.json")
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') != INDEX_VERSION:
+                return
+            self._counts = dict(index['atlases'])
+            self._entries = {key: tuple(value) for key, value in index['entries'].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing or damaged index: start empty, atlases get overwritten
+            self._entries, self._counts = {}, {}
+
+    def _atlas_path(self, name):
+        return os.path.join(self.root, name + ".png")
+
+    def _atlas(self, name):
+        image = self._loaded.get(name)
+        if image is None:
+            with Image.open(self._atlas_path(name)) as png:
+                image = png.convert("L")
+            self._loaded[name] = image
+            while len(self._loaded) > LOADED_ATLASES:
+                self._loaded.popitem(last=False)
+        else:
+            self._loaded.move_to_end(name)
+        return image
+
+    @staticmethod
+    def _slot_box(slot, size):
+        w, h = size
+        x, y = (slot % ATLAS_COLUMNS) * w, (slot // ATLAS_COLUMNS) * h
+        return (x, y, x + w, y + h)
+
+    def get(self, key, size):
+        """(size, mask bytes) stored under key, or None"""
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                return pending
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            name, slot = entry
+            try:
+                image = self._atlas(name).crop(self._slot_box(slot, size))
+            except (OSError, ValueError):
+                # Atlas missing or unreadable: forget what pointed into it
+                self._drop_atlas(name)
+                return None
+            return image.size, image.tobytes()
+
+    def put(self, key, preview):
+        with self._lock:
+            self._pending[key] = preview
+            if len(self._pending) >= FLUSH_BATCH:
+                self.flush()
+
+    def _drop_atlas(self, name):
+        self._entries = {k: v for k, v in self._entries.items() if v[0] != name}
+        self._counts.pop(name, None)
+        self._loaded.pop(name, None)
+
+    def _free_atlas(self, size):
+        """Name of an atlas for this thumbnail size with a free slot"""
+        prefix = f"{size[0]}x{size[1]}-"
+        for name, used in self._counts.items():
+            if name.startswith(prefix) and used < ATLAS_COLUMNS * ATLAS_ROWS:
+                return name
+        number = 0
+        while f"{prefix}{number}" in self._counts:
+            number += 1
+        return f"{prefix}{number}"
+
+    def flush(self):
+        """Write pending thumbnails into atlases and save the index"""
+        with self._lock:
+            if not self._pending:
+                return 0
+            os.makedirs(self.root, exist_ok=True)
+            written = 0
+            touched = {}
+            for key, (size, data) in self._pending.items():
+                if key in self._entries:
+                    continue
+                name = self._free_atlas(size)
+                used = self._counts.get(name, 0)
+                if name not in touched:
+                    try:
+                        touched[name] = self._atlas(name) if used else None
+                    except (OSError, ValueError):
+                        touched[name], used = None, 0
+                    if touched[name] is None:
+                        touched[name] = Image.new("L", (size[0] * ATLAS_COLUMNS, size[1] * ATLAS_ROWS))
+                        self._loaded[name] = touched[name]
+                touched[name].paste(Image.frombytes("L", size, data), self._slot_box(used, size))
+                self._entries[key] = (name, used)
+                self._counts[name] = used + 1
+                written += 1
+            self._pending.clear()
+            self._save(touched)
+            return written
+
+    def prune(self, keep):
+        """Drop stored thumbnails whose key fails `keep`; their atlases are repacked, empty ones deleted"""
+        with self._lock:
+            stale = {key for key in self._entries if not keep(key)}
+            if not stale:
+                return 0
+            touched = {}
+            for name in {self._entries[key][0] for key in stale}:
+                kept = sorted((slot, key) for key, (atlas, slot) in self._entries.items()
+                              if atlas == name and key not in stale)
+                try:
+                    old = self._atlas(name) if kept else None
+                except (OSError, ValueError):
+                    old = None
+                if old is None:
+                    self._drop_atlas(name)
+                    self._remove(self._atlas_path(name))
+                    continue
+                size = tuple(map(int, name.rsplit('-', 1)[0].split('x')))
+                image = Image.new("L", old.size)
+                for new_slot, (slot, key) in enumerate(kept):
+                    image.paste(old.crop(self._slot_box(slot, size)), self._slot_box(new_slot, size))
+                    self._entries[key] = (name, new_slot)
+                self._counts[name] = len(kept)
+                self._loaded[name] = touched[name] = image
+            for key in stale:
+                self._entries.pop(key, None)
+            self._save(touched)
+            return len(stale)
+
+    def _save(self, atlases):
+        """Write changed atlases, then the index pointing into them"""
+        try:
+            for name, image in atlases.items():
+                self._write(self._atlas_path(name), lambda path: image.save(path, "PNG"))
+            index = {'version': INDEX_VERSION, 'atlases': self._counts,
+                     'entries': {key: list(value) for key, value in self._entries.items()}}
+            self._write(self.index_path, lambda path: _save_json(path, index))
+        except OSError as e:
+            print(f"Thumbnail store write failed: {e}")
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _write(path, save):
+        # Write next to the target and swap, so a crash never leaves half a file
+        temp = path + ".tmp"
+        save(temp)
+        os.replace(temp, path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counts.clear()
+            self._pending.clear()
+            self._loaded.clear()
+            try:
+                for name in os.listdir(self.root):
+                    os.remove(os.path.join(self.root, name))
+            except OSError:
+                pass
+
+    def __len__(self):
+        return len(self._entries) + len(self._pending)
@@ -4,7 +4,7 @@ from PySide6.QtGui import QFont, QFontDatabase
 from PySide6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QWidget, QLabel
 from qfluentwidgets import (
     TitleLabel, SubtitleLabel, BodyLabel, CardWidget, ScrollArea,
-    ComboBox, LineEdit, isDarkTheme
+    ComboBox, LineEdit, isDarkTheme, qconfig
 )
 
 from config import tr, BOWLBY_FONT_PATH
@@ -148,6 +148,8 @@ class VersusComparerPage(QFrame):
             self.font2Combo.setCurrentIndex(1)
 
         self.update_comparison()
+        # Previews are cached as masks: a theme switch only recolours them
+        qconfig.themeChanged.connect(self.update_comparison)
 
     def _get_font_file(self, font_name):
         """Obtenir le chemin du fichier de police avec cache"""
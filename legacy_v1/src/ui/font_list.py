@@ -0,0 +1,426 @@
+import os
+from collections import OrderedDict
+from PySide6.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QRect, QRectF, QSize, QPoint, QTimer, QEvent, Signal
+)
+from PySide6.QtGui import QColor, QFont, QPen, QPainter, QCursor
+from PySide6.QtWidgets import QStyledItemDelegate
+from qfluentwidgets import ListView, FluentIcon as FIF, qconfig, isDarkTheme
+
+from config import tr
+from core import PreviewRenderWorker, PREVIEW_TEXT, PREVIEW_SIZE, pixmap_from_preview
+
+# --- Virtualized font lists ---
+# Rows are plain data in a QAbstractListModel and are painted by a delegate to
+# look like the old card widgets; no widget exists per row. Previews are only
+# rendered for rows the view actually shows and only the most recently shown
+# ones are kept (the preview caches in core sit behind PreviewRenderWorker).
+
+PathRole = Qt.ItemDataRole.UserRole
+StatusRole = Qt.ItemDataRole.UserRole + 1
+
+CARD_HEIGHT = 80
+CARD_SPACING = 10
+CARD_MARGIN = 16
+PREVIEW_HEIGHT = 48
+PREVIEW_WIDTH = PREVIEW_SIZE[0] * PREVIEW_HEIGHT // PREVIEW_SIZE[1]
+BUTTON_SIZE = 32
+PREVIEW_ROWS = 256
+
+
+class FontListModel(QAbstractListModel):
+    """Font rows keyed by path; previews are rendered on demand for the rows a view shows"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.paths = []
+        self.rows = {}  # path -> row
+        self.text = PREVIEW_TEXT
+        self._previews = OrderedDict()  # path -> [text, preview, tinted pixmap or None]
+        self.worker = PreviewRenderWorker()
+        self.worker.previews_ready.connect(self.apply_previews)
+        qconfig.themeChanged.connect(self.retint_previews)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+
+    def clear(self):
+        self.worker.cancel()
+        self.beginResetModel()
+        self._reset()
+        self.endResetModel()
+
+    def _reset(self):
+        self.paths = []
+        self.rows = {}
+        self._previews.clear()
+
+    def _append(self, paths, add):
+        """Append rows with one insert notification; `add` stores whatever else belongs to them"""
+        if not paths:
+            return
+        first = len(self.paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(paths) - 1)
+        self.paths.extend(paths)
+        self.rows.update((path, first + offset) for offset, path in enumerate(paths))
+        add()
+        self.endInsertRows()
+
+    def _row_changed(self, path, role):
+        row = self.rows.get(path)
+        if row is not None:
+            self.dataChanged.emit(self.index(row), self.index(row), [role])
+
+    def set_preview_text(self, text):
+        """New preview text; rows keep their old preview until the new one arrives"""
+        self.text = text or PREVIEW_TEXT
+
+    def preview_pixmap(self, path):
+        entry = self._previews.get(path)
+        if entry is None:
+            return None
+        self._previews.move_to_end(path)
+        if entry[2] is None:
+            entry[2] = pixmap_from_preview(entry[1])
+        return entry[2]
+
+    def render_previews(self, paths):
+        """Queue the given paths (in order) unless their preview for the current text is known"""
+        missing = [path for path in paths if self._previews.get(path, (None,))[0] != self.text]
+        if missing:
+            self.worker.submit(self.text, missing)
+
+    def _keep_preview(self, path, text, preview):
+        self._previews[path] = [text, preview, None]
+        self._previews.move_to_end(path)
+        while len(self._previews) > PREVIEW_ROWS:
+            self._previews.popitem(last=False)
+
+    def apply_previews(self, chunk):
+        for path, text, preview in chunk:
+            # Results for an older text may still arrive; ignore them
+            if text != self.text or preview is None:
+                continue
+            self._keep_preview(path, text, preview)
+            self._row_changed(path, Qt.ItemDataRole.DecorationRole)
+
+    def retint_previews(self, *_):
+        """Recolour previews for the current theme; nothing is re-rendered"""
+        for entry in self._previews.values():
+            entry[2] = None
+        if self.paths:
+            self.dataChanged.emit(self.index(0), self.index(len(self.paths) - 1), [Qt.ItemDataRole.DecorationRole])
+
+
+class LibraryModel(FontListModel):
+    """Installed font paths; `set_selection` narrows and orders the rows (search, coverage)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.all_paths = []
+        self.known = set()
+        self.selection = None
+
+    def _reset(self):
+        super()._reset()
+        self.all_paths = []
+        self.known = set()
+        self.selection = None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        path = self.paths[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return os.path.basename(path)
+        if role in (PathRole, Qt.ItemDataRole.ToolTipRole):
+            return path
+        return None
+
+    def add_paths(self, paths):
+        """Append a chunk of paths with one insert notification (shown only if no selection is set)"""
+        self.all_paths.extend(paths)
+        self.known.update(paths)
+        if self.selection is None:
+            self._append(paths, lambda: None)
+
+    def set_selection(self, paths):
+        """Show only `paths`, in this order (e.g. ranked search results); None shows every font.
+
+        Paths the model does not hold are skipped. Previews are kept.
+        """
+        self.selection = paths
+        shown = self.all_paths if paths is None else [path for path in paths if path in self.known]
+        self.beginResetModel()
+        self.paths = list(shown)
+        self.rows = {path: row for row, path in enumerate(self.paths)}
+        self.endResetModel()
+
+
+class ImportQueueModel(FontListModel):
+    """Analyzed fonts waiting for installation (font_data dicts from AnalyzeWorker) and their install results"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.fonts = []
+        self.status = {}  # path -> install succeeded, or locale key of why it was skipped
+
+    def _reset(self):
+        super()._reset()
+        # A new list: an InstallWorker may still be iterating the old one
+        self.fonts = []
+        self.status = {}
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        font_data = self.fonts[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            name = os.path.basename(font_data['path'])
+            return font_data.get('metadata', {}).get('family', name)
+        if role in (PathRole, Qt.ItemDataRole.ToolTipRole):
+            return font_data['path']
+        if role == StatusRole:
+            return self.status.get(font_data['path'])
+        return None
+
+    def add_fonts(self, chunk):
+        """Append a chunk of analyzed fonts; previews rendered during analysis seed the preview cache"""
+        chunk = [font_data for font_data in chunk if font_data and 'path' in font_data]
+
+        def add():
+            for font_data in chunk:
+                # The mask moves to the bounded preview cache instead of living on every row
+                preview = font_data.pop('preview', None)
+                if preview is not None:
+                    self._keep_preview(font_data['path'], PREVIEW_TEXT, preview)
+            self.fonts.extend(chunk)
+        self._append([font_data['path'] for font_data in chunk], add)
+
+    def font_data(self, path):
+        # Not a model role: font_data holds itself as 'metadata', which QVariant cannot convert
+        row = self.rows.get(path)
+        return None if row is None else self.fonts[row]
+
+    def set_status(self, path, status):
+        self.status[path] = status
+        self._row_changed(path, StatusRole)
+
+
+def _card_rect(option):
+    return option.rect.adjusted(0, CARD_SPACING // 2, -1, -CARD_SPACING // 2)
+
+def _paint_card(painter, rect, hover):
+    # Same glassmorphism look as the card widgets
+    painter.setPen(QPen(QColor(255, 255, 255, 77 if hover else 51), 1))
+    painter.setBrush(QColor(255, 255, 255, 38 if hover else 26))
+    painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), 12, 12)
+
+def _paint_preview(painter, rect, pixmap):
+    """Preview pixmap scaled to the row height, or the generic font icon while it renders"""
+    if pixmap is None or pixmap.isNull():
+        FIF.FONT_SIZE.render(painter, QRectF(rect.x(), rect.y(), PREVIEW_HEIGHT, PREVIEW_HEIGHT))
+        return
+    width = pixmap.width() * PREVIEW_HEIGHT // max(1, pixmap.height())
+    painter.drawPixmap(QRect(rect.x(), rect.y(), width, PREVIEW_HEIGHT), pixmap)
+
+def _text_color():
+    return QColor(255, 255, 255) if isDarkTheme() else QColor(0, 0, 0)
+
+
+class FontRowDelegate(QStyledItemDelegate):
+    """Paints a font row like the card widgets: preview, title, caption and a trailing part"""
+    open_requested = Signal(str)
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.hover_row = -1
+        self.title_font = QFont("Segoe UI Variable Display", 14)
+        self.title_font.setBold(True)
+        self.caption_font = QFont("Segoe UI", 9)
+
+    # Hooks called by qfluentwidgets' ListView
+    def setHoverRow(self, row):
+        self.hover_row = row
+
+    def setPressedRow(self, row):
+        pass
+
+    def setSelectedRows(self, indexes):
+        pass
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), CARD_HEIGHT + CARD_SPACING)
+
+    def caption(self, index):
+        """(text, colour) of the line under the title; none by default"""
+        return "", QColor(150, 150, 150)
+
+    def paint_trailing(self, painter, option, index):
+        """Paint the right-hand part of the row and return its left edge; nothing by default"""
+        return _card_rect(option).right()
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        rect = _card_rect(option)
+        _paint_card(painter, rect, index.row() == self.hover_row)
+
+        top = rect.center().y() - PREVIEW_HEIGHT // 2
+        _paint_preview(painter, QRect(rect.x() + CARD_MARGIN, top, PREVIEW_WIDTH, PREVIEW_HEIGHT),
+                       self.model.preview_pixmap(index.data(PathRole)))
+
+        right = self.paint_trailing(painter, option, index)
+        left = rect.x() + CARD_MARGIN + PREVIEW_WIDTH + CARD_MARGIN
+        text_width = max(0, right - CARD_MARGIN - left)
+        align = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+        painter.setFont(self.title_font)
+        painter.setPen(_text_color())
+        title = painter.fontMetrics().elidedText(index.data(), Qt.TextElideMode.ElideRight, text_width)
+        painter.drawText(QRect(left, top, text_width, 26), align, title)
+        text, color = self.caption(index)
+        painter.setFont(self.caption_font)
+        painter.setPen(color)
+        painter.drawText(QRect(left, top + 28, text_width, 20), align, text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            if _card_rect(option).contains(event.position().toPoint()):
+                self.open_requested.emit(index.data(PathRole))
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class LibraryDelegate(FontRowDelegate):
+    """Library row: file name, "installed" and a delete button"""
+    uninstall_requested = Signal(str)
+
+    @staticmethod
+    def button_rect(option):
+        rect = _card_rect(option)
+        return QRect(rect.right() - CARD_MARGIN - BUTTON_SIZE, rect.center().y() - BUTTON_SIZE // 2,
+                     BUTTON_SIZE, BUTTON_SIZE)
+
+    def caption(self, index):
+        return tr("installed"), QColor("#00CC6A")
+
+    def paint_trailing(self, painter, option, index):
+        button = self.button_rect(option)
+        view = option.widget
+        if view is not None and index.row() == self.hover_row and \
+                button.contains(view.viewport().mapFromGlobal(QCursor.pos())):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(255, 255, 255, 24) if isDarkTheme() else QColor(0, 0, 0, 15))
+            painter.drawRoundedRect(QRectF(button), 5, 5)
+        FIF.DELETE.render(painter, QRectF(button.center().x() - 7.5, button.center().y() - 7.5, 16, 16))
+        return button.left()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton \
+                and self.button_rect(option).contains(event.position().toPoint()):
+            self.uninstall_requested.emit(index.data(PathRole))
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class ImportQueueDelegate(FontRowDelegate):
+    """Import queue row: family, style and size, and the analysis or install status"""
+
+    def __init__(self, model, parent=None):
+        super().__init__(model, parent)
+        self.status_font = QFont("Segoe UI", 15)
+        self.status_font.setWeight(QFont.Weight.DemiBold)
+
+    def caption(self, index):
+        font_data = self.model.font_data(index.data(PathRole))
+        style = font_data.get('metadata', {}).get('style', 'Regular')
+        try:
+            size_kb = (font_data.get('file_size') or os.path.getsize(font_data['path'])) // 1024
+        except OSError:
+            size_kb = 0
+        return f"{style} • {size_kb} KB", QColor(150, 150, 150) if isDarkTheme() else QColor(120, 120, 120)
+
+    @staticmethod
+    def status(font_data, installed):
+        """(text, colour or None for the theme's text colour), as FontCard showed it"""
+        if isinstance(installed, str):
+            # Skipped by InstallWorker
+            return tr(installed), QColor("#FFAA00")
+        if installed is not None:
+            return (tr("installed"), QColor("#00CC6A")) if installed else (tr("failed"), QColor("#FF4444"))
+        if not font_data.get('valid', False):
+            return tr("invalid"), QColor("#FF4444")
+        if font_data.get('installed', False):
+            return tr("already_installed"), QColor("#FFAA00")
+        return tr("ready"), None
+
+    def paint_trailing(self, painter, option, index):
+        text, color = self.status(self.model.font_data(index.data(PathRole)), index.data(StatusRole))
+        rect = _card_rect(option)
+        painter.setFont(self.status_font)
+        painter.setPen(color or _text_color())
+        width = painter.fontMetrics().horizontalAdvance(text)
+        box = QRect(rect.right() - CARD_MARGIN - width, rect.y(), width, rect.height())
+        painter.drawText(box, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, text)
+        return box.left()
+
+
+class FontListView(ListView):
+    """Delegate-painted font rows; asks its model for previews of the rows on screen"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(ListView.SelectionMode.NoSelection)
+        self.setVerticalScrollMode(ListView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setStyleSheet("ListView { background: transparent; border: none; }")
+        self.font_model = None
+
+        # Coalesce scroll steps, resizes and inserts into one render request
+        self.previewTimer = QTimer(self)
+        self.previewTimer.setSingleShot(True)
+        self.previewTimer.setInterval(30)
+        self.previewTimer.timeout.connect(self.request_previews)
+        self.verticalScrollBar().valueChanged.connect(self.schedule_previews)
+
+    def set_models(self, font_model, proxy=None):
+        """Show `font_model`, through `proxy` if given (e.g. a QSortFilterProxyModel)"""
+        self.font_model = font_model
+        model = proxy or font_model
+        self.setModel(model)
+        model.rowsInserted.connect(self.schedule_previews)
+        model.modelReset.connect(self.schedule_previews)
+        model.layoutChanged.connect(self.schedule_previews)
+
+    def schedule_previews(self, *_):
+        self.previewTimer.start()
+
+    def visible_paths(self):
+        """Paths of the rows inside the viewport, top to bottom"""
+        model = self.model()
+        if model is None or not model.rowCount():
+            return []
+        first = self.indexAt(QPoint(1, 1)).row()
+        last = self.indexAt(QPoint(1, self.viewport().height() - 1)).row()
+        first = max(first, 0)
+        last = model.rowCount() - 1 if last < 0 else last
+        return [model.index(row, 0).data(PathRole) for row in range(first, last + 1)]
+
+    def request_previews(self):
+        if self.font_model is not None:
+            self.font_model.render_previews(self.visible_paths())
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        self.schedule_previews()
+
+    def mouseMoveEvent(self, e):
+        super().mouseMoveEvent(e)
+        # Repaint the hovered row so a button highlight follows the cursor
+        index = self.indexAt(e.position().toPoint())
+        if index.isValid():
+            self.viewport().update(self.visualRect(index))
@@ -1,13 +1,22 @@
 import sys
 import os
-from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QFont, QFontDatabase
-from PySide6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QWidget, QGridLayout, QLabel, QScrollArea
+import unicodedata
+from PySide6.QtCore import Qt, QSize, QRectF, QAbstractListModel, QModelIndex, QTimer
+from PySide6.QtGui import QFont, QFontDatabase, QRawFont, QColor, QPen, QPainter
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QStyledItemDelegate
 from qfluentwidgets import (
-    TitleLabel, SubtitleLabel, ComboBox, CardWidget, FluentIcon as FIF,
-    ToolButton, SearchLineEdit, ScrollArea
+    TitleLabel, SubtitleLabel, CaptionLabel, ComboBox, FluentIcon as FIF,
+    ToolButton, ListView, LineEdit, isDarkTheme
 )
 from config import tr, BOWLBY_FONT_PATH
+from core import CoverageQueryWorker, family_key
+from coverage import SCRIPTS, text_codepoints
+from sfnt import SfntError, decode_cmap_table
+
+GLYPH_CELL = 80
+GLYPH_SPACING = 10
+# Code points that draw nothing: controls, format characters, spaces, surrogates
+HIDDEN_CATEGORIES = ('Cc', 'Cf', 'Zs', 'Zl', 'Zp', 'Cs')
 
 def _apply_bowlby_font(label):
     """Apply Bowlby One SC font to a title label via stylesheet"""
@@ -15,6 +24,83 @@ def _apply_bowlby_font(label):
         QFontDatabase.addApplicationFont(BOWLBY_FONT_PATH)
         label.setStyleSheet("font-family: 'Bowlby One SC'; font-size: 32px;")
 
+def family_codepoints(font):
+    """Sorted code points the font's own cmap maps to a visible glyph"""
+    raw = QRawFont.fromFont(font)
+    if not raw.isValid():
+        return []
+    table = raw.fontTable("cmap")
+    if table.isEmpty():
+        return []
+    try:
+        cmap = decode_cmap_table(table.data())
+    except SfntError:
+        return []
+    return [code for code in sorted(cmap)
+            if unicodedata.category(chr(code)) not in HIDDEN_CATEGORIES]
+
+
+class GlyphModel(QAbstractListModel):
+    """Code points of one font; a row is only data, the delegate draws it"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.codepoints = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.codepoints)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        code = self.codepoints[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return chr(code)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"U+{code:04X} {unicodedata.name(chr(code), '')}".rstrip()
+        return None
+
+    def set_codepoints(self, codepoints):
+        self.beginResetModel()
+        self.codepoints = codepoints
+        self.endResetModel()
+
+
+class GlyphDelegate(QStyledItemDelegate):
+    """Paints a glyph cell: rounded card with the character centred in the inspected font"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font = QFont()
+        self.hover_row = -1
+
+    # Hooks called by qfluentwidgets' ListView
+    def setHoverRow(self, row):
+        self.hover_row = row
+
+    def setPressedRow(self, row):
+        pass
+
+    def setSelectedRows(self, indexes):
+        pass
+
+    def sizeHint(self, option, index):
+        return QSize(GLYPH_CELL + GLYPH_SPACING, GLYPH_CELL + GLYPH_SPACING)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = QRectF(option.rect.x() + 0.5, option.rect.y() + 0.5, GLYPH_CELL - 1, GLYPH_CELL - 1)
+        hover = index.row() == self.hover_row
+        painter.setPen(QPen(QColor(255, 255, 255, 77 if hover else 26), 1))
+        painter.setBrush(QColor(255, 255, 255, 26 if hover else 13))
+        painter.drawRoundedRect(rect, 8, 8)
+        painter.setFont(self.font)
+        painter.setPen(QColor(255, 255, 255) if isDarkTheme() else QColor(0, 0, 0))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, index.data())
+        painter.restore()
+
+
 class GlyphInspectorPage(QFrame):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -42,98 +128,100 @@ class GlyphInspectorPage(QFrame):
         self.refreshBtn.clicked.connect(self.load_fonts)
         toolLayout.addWidget(self.refreshBtn)
 
-        toolLayout.addStretch(1)
+        # Coverage filter: only families with an installed font covering a script and/or typed characters
+        self.coverage_options = [None, *SCRIPTS]
+        self.coverageBox = ComboBox(self)
+        self.coverageBox.addItems([tr("coverage_any"), *(tr(f"script_{name}") for name in SCRIPTS)])
+        self.coverageBox.currentIndexChanged.connect(self.update_coverage)
+        toolLayout.addWidget(self.coverageBox)
+
+        self.coverText = LineEdit(self)
+        self.coverText.setPlaceholderText(tr("coverage_characters"))
+        self.coverText.textChanged.connect(lambda _: self.coverageTimer.start())
+        toolLayout.addWidget(self.coverText)
+
+        self.coverageTimer = QTimer(self)
+        self.coverageTimer.setSingleShot(True)
+        self.coverageTimer.setInterval(150)
+        self.coverageTimer.timeout.connect(self.update_coverage)
+        self.coverage_query = None
+        self.families = []
 
-        self.vBoxLayout.addLayout(toolLayout)
+        toolLayout.addStretch(1)
 
-        # Grid Area
-        self.scrollArea = ScrollArea(self)
-        self.scrollArea.setWidgetResizable(True)
-        self.scrollArea.setStyleSheet("background-color: transparent; border: none;")
+        self.countLabel = CaptionLabel("", self)
+        toolLayout.addWidget(self.countLabel)
 
-        self.scrollContent = QWidget()
-        self.scrollContent.setStyleSheet("background-color: transparent;")
-        self.gridLayout = QGridLayout(self.scrollContent)
-        self.gridLayout.setSpacing(10)
-        self.scrollArea.setWidget(self.scrollContent)
+        self.vBoxLayout.addLayout(toolLayout)
 
-        self.vBoxLayout.addWidget(self.scrollArea)
+        # Grid: one model row per mapped code point, painted by the delegate
+        self.glyphModel = GlyphModel(self)
+        self.glyphDelegate = GlyphDelegate(self)
+        self.glyphView = ListView(self)
+        self.glyphView.setItemDelegate(self.glyphDelegate)
+        self.glyphView.setModel(self.glyphModel)
+        self.glyphView.setFlow(ListView.Flow.LeftToRight)
+        self.glyphView.setWrapping(True)
+        self.glyphView.setResizeMode(ListView.ResizeMode.Adjust)
+        self.glyphView.setUniformItemSizes(True)
+        self.glyphView.setLayoutMode(ListView.LayoutMode.Batched)
+        self.glyphView.setBatchSize(2000)
+        self.glyphView.setSelectionMode(ListView.SelectionMode.NoSelection)
+        self.glyphView.setVerticalScrollMode(ListView.ScrollMode.ScrollPerPixel)
+        self.glyphView.setStyleSheet("ListView { background: transparent; border: none; }")
+        self.vBoxLayout.addWidget(self.glyphView)
 
         self.load_fonts()
 
     def load_fonts(self):
+        self.families = QFontDatabase.families()
+        self.show_families(self.families)
+        self.update_coverage()
+
+    def show_families(self, fonts):
+        """Fill the combo, keeping the current family selected if it is still listed"""
+        current = self.fontCombo.currentText()
+        self.fontCombo.blockSignals(True)
         self.fontCombo.clear()
-        db = QFontDatabase()
-        fonts = db.families()
         self.fontCombo.addItems(fonts)
         if fonts:
-            self.fontCombo.setCurrentIndex(0)
+            self.fontCombo.setCurrentIndex(fonts.index(current) if current in fonts else 0)
+        self.fontCombo.blockSignals(False)
+        if not fonts or self.fontCombo.currentText() != current:
+            self.load_glyphs(self.fontCombo.currentText() if fonts else "")
+
+    def update_coverage(self, *_):
+        """Query which installed families cover the chosen characters (off the GUI thread)"""
+        option = self.coverage_options[max(0, self.coverageBox.currentIndex())]
+        codepoints = text_codepoints(self.coverText.text())
+        if option is not None:
+            codepoints |= text_codepoints(SCRIPTS[option])
+        if not codepoints:
+            self.coverage_query = None
+            self.show_families(self.families)
+            return
+        self.coverage_query = frozenset(codepoints)
+        worker = CoverageQueryWorker(self.coverage_query, self)
+        worker.results_ready.connect(self.apply_coverage)
+        worker.finished.connect(worker.deleteLater)
+        worker.start()
+
+    def apply_coverage(self, result):
+        codepoints, _, families = result
+        # Answers to an older query may still arrive; ignore them
+        if codepoints == self.coverage_query:
+            self.show_families([name for name in self.families if family_key(name) in families])
 
     def load_glyphs(self, font_family):
-        # Clear grid
-        for i in reversed(range(self.gridLayout.count())):
-            widget = self.gridLayout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-
-        if not font_family or font_family == "":
+        if not font_family or font_family not in QFontDatabase.families():
+            self.glyphModel.set_codepoints([])
+            self.countLabel.setText("")
             return
 
-        try:
-            # Vérifier que la police existe dans la base de données
-            db = QFontDatabase()
-            if font_family not in db.families():
-                print(f"Police non trouvée: {font_family}")
-                return
-
-            font = QFont(font_family, 24)
-            font.setStyleHint(QFont.AnyStyle)
-
-            # Couleur du texte adaptée au thème
-            from qfluentwidgets import isDarkTheme
-            text_color = "#ffffff" if isDarkTheme() else "#000000"
-
-            # Display a range of common glyphs
-            row = 0
-            col = 0
-            max_cols = 8
-
-            # ASCII + Latin-1 Supplement + Common Symbols
-            ranges = [(33, 126), (161, 255), (0x20A0, 0x20CF)]
-
-            for start, end in ranges:
-                for code in range(start, end + 1):
-                    char = chr(code)
-
-                    card = CardWidget(self.scrollContent)
-                    card.setFixedSize(80, 80)
-                    card.setStyleSheet("""
-                        CardWidget {
-                            background-color: rgba(255, 255, 255, 0.05);
-                            border: 1px solid rgba(255, 255, 255, 0.1);
-                            border-radius: 8px;
-                        }
-                        CardWidget:hover {
-                            background-color: rgba(255, 255, 255, 0.1);
-                            border: 1px solid rgba(255, 255, 255, 0.3);
-                        }
-                    """)
-
-                    layout = QVBoxLayout(card)
-                    layout.setAlignment(Qt.AlignCenter)
-
-                    lbl = QLabel(char, card)
-                    lbl.setFont(font)
-                    lbl.setAlignment(Qt.AlignCenter)
-                    lbl.setStyleSheet(f"color: {text_color}; background: transparent;")
-                    layout.addWidget(lbl)
-
-                    self.gridLayout.addWidget(card, row, col)
-
-                    col += 1
-                    if col >= max_cols:
-                        col = 0
-                        row += 1
-        except Exception as e:
-            print(f"Erreur lors du chargement des glyphes: {e}")
-
+        font = QFont(font_family, 24)
+        font.setStyleHint(QFont.AnyStyle)
+        self.glyphDelegate.font = font
+        codepoints = family_codepoints(font)
+        self.glyphModel.set_codepoints(codepoints)
+        self.glyphView.scrollToTop()
+        self.countLabel.setText(tr("glyph_count").format(len(codepoints)))
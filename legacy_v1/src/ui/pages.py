@@ -1,5 +1,5 @@
 import os
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QIcon, QDragEnterEvent, QDropEvent, QFont, QFontDatabase
 from PySide6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QWidget, QFileDialog
 from qfluentwidgets import (
@@ -9,12 +9,19 @@ from qfluentwidgets import (
     MessageBox, InfoBar, InfoBarPosition, Theme, setTheme, FluentIcon as FIF
 )
 
-from config import tr, SETTINGS, GOOGLE_FONTS, BOWLBY_FONT_PATH, get_resource
+from config import tr, SETTINGS, BOWLBY_FONT_PATH, get_resource
 from core import (
-    AnalyzeWorker, InstallWorker, LoadLibraryWorker, DownloadWorker, GoogleFontsWorker,
-    uninstall_font_system, restart_explorer, install_font_system, extract_archive
+    AnalyzeWorker, InstallWorker, LoadLibraryWorker, GoogleFontsWorker, CoverageQueryWorker, download_manager,
+    uninstall_font_system, restart_explorer, install_font_system, list_archive_fonts, ImportIndex,
+    installed_font_index
+)
+from archive import is_archive
+from coverage import SCRIPTS, text_codepoints
+from catalog import FACETS, CATEGORIES
+from ui.components import GoogleFontCard
+from ui.font_list import (
+    LibraryModel, ImportQueueModel, FontListView, LibraryDelegate, ImportQueueDelegate
 )
-from ui.components import FontCard, LibraryCard, GoogleFontCard
 
 def _apply_bowlby_font(label):
     """Apply Bowlby One SC font to a title label via stylesheet"""
@@ -85,24 +92,20 @@ class HomePage(QFrame):
 
         self.vBoxLayout.addLayout(actionLayout)
 
-        self.scrollArea = ScrollArea(self)
-        self.scrollArea.setWidgetResizable(True)
-        self.scrollArea.setStyleSheet("background-color: transparent; border: none;")
-        self.scrollContent = QWidget()
-        self.scrollContent.setStyleSheet("background-color: transparent;")
-        self.scrollLayout = QVBoxLayout(self.scrollContent)
-        self.scrollLayout.setSpacing(10)
-        self.scrollLayout.setAlignment(Qt.AlignTop)
-        self.scrollArea.setWidget(self.scrollContent)
-
-        self.vBoxLayout.addWidget(self.scrollArea)
+        # Import queue: one model row per analyzed font, painted by the delegate
+        self.model = ImportQueueModel(self)
+        self.listView = FontListView(self)
+        self.delegate = ImportQueueDelegate(self.model, self.listView)
+        self.delegate.open_requested.connect(self.show_preview_window)
+        self.listView.setItemDelegate(self.delegate)
+        self.listView.set_models(self.model)
+        self.vBoxLayout.addWidget(self.listView)
 
         self.progressBar = ProgressBar(self)
         self.progressBar.hide()
         self.vBoxLayout.addWidget(self.progressBar)
 
-        self.fonts = []
-        self.cards = {}
+        self.import_index = ImportIndex()
         self.setAcceptDrops(True)
 
     def dragEnterEvent(self, event: QDragEnterEvent):
@@ -116,7 +119,7 @@ class HomePage(QFrame):
         self.process_files(files)
 
     def add_files(self):
-        files, _ = QFileDialog.getOpenFileNames(self, "Select Fonts", "", "Fonts & Archives (*.ttf *.otf *.woff *.ttc *.zip)")
+        files, _ = QFileDialog.getOpenFileNames(self, "Select Fonts", "", "Fonts & Archives (*.ttf *.otf *.woff *.ttc *.zip *.tar *.tar.gz *.tgz *.tar.bz2 *.tar.xz)")
         if files:
             self.process_files(files)
 
@@ -134,55 +137,49 @@ class HomePage(QFrame):
         processed_files = []
 
         for file_path in files:
-            if file_path.lower().endswith('.zip'):
-                # Extract archive
-                extract_dir = extract_archive(file_path)
-                if extract_dir:
-                    for root, _, filenames in os.walk(extract_dir):
-                        for filename in filenames:
-                            if filename.lower().endswith(('.ttf', '.otf', '.woff', '.ttc')):
-                                processed_files.append(os.path.join(root, filename))
+            if is_archive(file_path):
+                # Fonts are read straight from the archive; nothing is extracted
+                processed_files.extend(list_archive_fonts(file_path))
             elif file_path.lower().endswith(('.ttf', '.otf', '.woff', '.ttc')):
                 processed_files.append(file_path)
 
-        new_files = [f for f in processed_files if f not in [x['path'] for x in self.fonts]]
+        # Same path twice is dropped here; same bytes under another path in the worker
+        new_files = [f for f in processed_files if self.import_index.add_path(f)]
         if not new_files: return
 
-        self.worker = AnalyzeWorker(new_files)
-        self.worker.font_analyzed.connect(self.add_font_card)
+        self.worker = AnalyzeWorker(new_files, import_index=self.import_index)
+        self.worker.fonts_analyzed.connect(self.add_font_rows)
         self.worker.start()
 
-    def add_font_card(self, font_data):
-        """Add a font card to the list with error handling"""
-        try:
-            if not font_data or 'path' not in font_data:
-                return
-
-            self.fonts.append(font_data)
-            card = FontCard(font_data)
-            self.scrollLayout.addWidget(card)
-            self.cards[font_data['path']] = card
-            card.setVisible(True)
-        except Exception as e:
-            # Silently skip errors
-            pass
+    def add_font_rows(self, chunk):
+        """Add a whole chunk of analyzed fonts with a single insert"""
+        self.model.add_fonts(chunk)
+
+    def show_preview_window(self, path):
+        """Open the detailed font preview modal"""
+        from ui.preview import FontPreviewWindow
+
+        font_data = self.model.font_data(path)
+        if font_data is None:
+            return
+        self.preview_window = FontPreviewWindow(font_data, self.window())
+        self.preview_window.exec()
 
     def clear_list(self):
-        for i in reversed(range(self.scrollLayout.count())):
-            self.scrollLayout.itemAt(i).widget().setParent(None)
-        self.fonts.clear()
-        self.cards.clear()
+        self.model.clear()
+        self.import_index.clear()
 
     def install_fonts(self):
-        if not self.fonts: return
+        if not self.model.fonts: return
 
         self.progressBar.setValue(0)
         self.progressBar.show()
         self.btnInstall.setDisabled(True)
 
-        self.install_worker = InstallWorker(self.fonts)
+        self.install_worker = InstallWorker(self.model.fonts)
         self.install_worker.progress.connect(self.update_progress)
-        self.install_worker.item_updated.connect(self.update_card_status)
+        self.install_worker.item_updated.connect(self.model.set_status)
+        self.install_worker.item_skipped.connect(self.model.set_status)
         self.install_worker.finished.connect(self.install_finished)
         self.install_worker.start()
 
@@ -190,10 +187,6 @@ class HomePage(QFrame):
         val = int((current / total) * 100)
         self.progressBar.setValue(val)
 
-    def update_card_status(self, path, success):
-        if path in self.cards:
-            self.cards[path].set_status(success)
-
     def install_finished(self, count):
         self.progressBar.setValue(100)
         self.btnInstall.setDisabled(False)
@@ -231,57 +224,125 @@ class LibraryPage(QFrame):
 
         self.previewBox = LineEdit(self)
         self.previewBox.setPlaceholderText(tr("preview_text"))
-        self.previewBox.textChanged.connect(self.update_previews)
+        self.previewBox.textChanged.connect(self.schedule_previews)
         toolLayout.addWidget(self.previewBox)
 
+        # Preview text is rendered off the GUI thread once typing pauses
+        self.previewTimer = QTimer(self)
+        self.previewTimer.setSingleShot(True)
+        self.previewTimer.setInterval(150)
+        self.previewTimer.timeout.connect(lambda: self.update_previews(self.previewBox.text()))
+
+        # Coverage filter: a script's alphabet, or every character of the preview text
+        self.coverage_options = [None, *SCRIPTS, 'preview']
+        self.coverageBox = ComboBox(self)
+        self.coverageBox.addItems([tr("coverage_any"), *(tr(f"script_{name}") for name in SCRIPTS),
+                                   tr("coverage_preview_text")])
+        self.coverageBox.currentIndexChanged.connect(self.update_coverage)
+        toolLayout.addWidget(self.coverageBox)
+        self.coverage_query = None
+        self.coverage_paths = None
+
         self.btnRefresh = ToolButton(FIF.SYNC, self)
         self.btnRefresh.clicked.connect(self.load_fonts)
         toolLayout.addWidget(self.btnRefresh)
 
         self.vBoxLayout.addLayout(toolLayout)
 
-        # List
-        self.scrollArea = ScrollArea(self)
-        self.scrollArea.setWidgetResizable(True)
-        self.scrollArea.setStyleSheet("background-color: transparent; border: none;")
-        self.scrollContent = QWidget()
-        self.scrollContent.setStyleSheet("background-color: transparent;")
-        self.scrollLayout = QVBoxLayout(self.scrollContent)
-        self.scrollLayout.setSpacing(10)
-        self.scrollLayout.setAlignment(Qt.AlignTop)
-        self.scrollArea.setWidget(self.scrollContent)
-
-        self.vBoxLayout.addWidget(self.scrollArea)
-
-        self.font_cards = []
+        # List: one model row per font, painted by the delegate; only visible rows get previews
+        self.model = LibraryModel(self)
+        self.listView = FontListView(self)
+        self.delegate = LibraryDelegate(self.model, self.listView)
+        self.delegate.open_requested.connect(self.show_preview_window)
+        self.delegate.uninstall_requested.connect(self.uninstall_font)
+        self.listView.setItemDelegate(self.delegate)
+        self.listView.set_models(self.model)
+        self.vBoxLayout.addWidget(self.listView)
 
         self.load_fonts()
 
     def load_fonts(self):
-        for i in reversed(range(self.scrollLayout.count())):
-            self.scrollLayout.itemAt(i).widget().setParent(None)
-        self.font_cards.clear()
+        self.model.clear()
+        self.search_ready = False
 
         self.worker = LoadLibraryWorker()
-        self.worker.font_found.connect(self.add_font_item)
+        self.worker.fonts_found.connect(self.add_font_items)
+        self.worker.index_ready.connect(self.on_index_ready)
         self.worker.start()
+        self.update_coverage()
 
-    def add_font_item(self, file_path):
-        card = LibraryCard(file_path)
-        card.uninstall_requested.connect(self.uninstall_font)
-        self.scrollLayout.addWidget(card)
-        self.font_cards.append((os.path.basename(file_path).lower(), card))
+    def add_font_items(self, paths):
+        """Add a chunk of installed fonts as model rows"""
+        self.model.add_paths(paths)
+
+    def on_index_ready(self):
+        self.search_ready = True
+        self.apply_filters()
 
     def filter_list(self, text):
-        text = text.lower()
-        for name, card in self.font_cards:
-            if text in name: card.show()
-            else: card.hide()
+        self.apply_filters()
+
+    def apply_filters(self):
+        """Show the fonts matching the search box (ranked) and the coverage filter"""
+        query = self.searchBox.text().strip()
+        paths = None
+        if query and self.search_ready:
+            paths = installed_font_index().search(query)
+        elif query:
+            # Name index still building: file names only
+            query = query.casefold()
+            paths = [path for path in self.model.all_paths if query in os.path.basename(path).casefold()]
+        if self.coverage_paths is not None:
+            paths = [path for path in (self.model.all_paths if paths is None else paths)
+                     if path in self.coverage_paths]
+        self.model.set_selection(paths)
+
+    def schedule_previews(self, *_):
+        """Debounce: restart the timer on every keystroke"""
+        self.previewTimer.start()
 
     def update_previews(self, text):
-        for _, card in self.font_cards:
-            if card.isVisible():
-                card.update_preview(text)
+        """Switch the preview text; the rows on screen are rendered again"""
+        self.model.set_preview_text(text)
+        self.listView.request_previews()
+        if self.coverage_options[self.coverageBox.currentIndex()] == 'preview':
+            self.update_coverage()
+
+    def update_coverage(self, *_):
+        """Limit the list to fonts whose cmap covers the chosen characters (queried off the GUI thread)"""
+        option = self.coverage_options[max(0, self.coverageBox.currentIndex())]
+        if option is None:
+            self.coverage_query = None
+            self.coverage_paths = None
+            self.apply_filters()
+            return
+        text = self.previewBox.text() if option == 'preview' else SCRIPTS[option]
+        self.coverage_query = frozenset(text_codepoints(text))
+        worker = CoverageQueryWorker(self.coverage_query, self)
+        worker.results_ready.connect(self.apply_coverage)
+        worker.finished.connect(worker.deleteLater)
+        worker.start()
+
+    def apply_coverage(self, result):
+        codepoints, paths, _ = result
+        # Answers to an older query may still arrive; ignore them
+        if codepoints == self.coverage_query:
+            self.coverage_paths = paths
+            self.apply_filters()
+
+    def show_preview_window(self, file_path):
+        """Open the detailed font preview modal"""
+        from ui.preview import FontPreviewWindow
+
+        # 'installed': True shows the uninstall button
+        data = {
+            'path': file_path,
+            'metadata': {'family': os.path.basename(file_path).rsplit('.', 1)[0]},
+            'installed': True,
+        }
+        self.preview_window = FontPreviewWindow(data, self.window())
+        self.preview_window.uninstall_requested.connect(lambda _: self.uninstall_font(file_path))
+        self.preview_window.exec()
 
     def uninstall_font(self, file_path):
         name = os.path.basename(file_path)
@@ -294,6 +355,10 @@ class LibraryPage(QFrame):
                 InfoBar.error("Error", "Failed to uninstall font.", duration=3000, parent=self)
 
 class GoogleFontsPage(QFrame):
+    """Store: a local Google Fonts catalog, filtered by facets and name, shown one page of cards at a time"""
+
+    PAGE_SIZE = 20
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("GoogleFontsPage")
@@ -313,12 +378,34 @@ class GoogleFontsPage(QFrame):
         self.searchBox.textChanged.connect(self.filter_list)
         toolLayout.addWidget(self.searchBox)
 
+        # Facets: (facet, value) per combo box entry, None = any
+        self.facet_boxes = {}
+        for facet in FACETS:
+            box = ComboBox(self)
+            box.currentIndexChanged.connect(self.apply_filters)
+            toolLayout.addWidget(box)
+            self.facet_boxes[facet] = box
+        self.facet_values = {facet: [None] for facet in FACETS}
+
+        self.btnCatalog = ToolButton(FIF.DOCUMENT, self)
+        self.btnCatalog.setToolTip(tr("choose_catalog"))
+        self.btnCatalog.clicked.connect(self.choose_catalog)
+        toolLayout.addWidget(self.btnCatalog)
+
+        self.btnCatalogFolder = ToolButton(FIF.FOLDER, self)
+        self.btnCatalogFolder.setToolTip(tr("choose_catalog_folder"))
+        self.btnCatalogFolder.clicked.connect(self.choose_catalog_folder)
+        toolLayout.addWidget(self.btnCatalogFolder)
+
         self.btnRefresh = ToolButton(FIF.SYNC, self)
         self.btnRefresh.clicked.connect(self.load_fonts)
         toolLayout.addWidget(self.btnRefresh)
 
         self.vBoxLayout.addLayout(toolLayout)
 
+        self.countLabel = CaptionLabel("", self)
+        self.vBoxLayout.addWidget(self.countLabel)
+
         # List
         self.scrollArea = ScrollArea(self)
         self.scrollArea.setWidgetResizable(True)
@@ -329,92 +416,200 @@ class GoogleFontsPage(QFrame):
         self.scrollLayout.setSpacing(10)
         self.scrollLayout.setAlignment(Qt.AlignTop)
         self.scrollArea.setWidget(self.scrollContent)
+        # Next page when the end of the list comes into view (or the list does not fill it)
+        scrollBar = self.scrollArea.verticalScrollBar()
+        scrollBar.valueChanged.connect(self.maybe_show_more)
+        scrollBar.rangeChanged.connect(self.maybe_show_more)
 
         self.vBoxLayout.addWidget(self.scrollArea)
 
-        self.font_cards = []
-        self.download_workers = {}
+        self.catalog = None
+        self.results = []  # catalog family numbers, in display order
+        self.cards = []  # every card created so far; the first `shown` ones show results
+        self.shown = 0
+        self.downloads = {}  # url -> family, for this page's downloads in progress
+        self.download_progress = {}  # family -> (received, total), restored on reused cards
+        download_manager().progress.connect(self.on_download_progress)
+        download_manager().finished.connect(self.on_download_finished)
 
         self.load_fonts()
 
     def load_fonts(self):
-        for i in reversed(range(self.scrollLayout.count())):
-            self.scrollLayout.itemAt(i).widget().setParent(None)
-        self.font_cards.clear()
-
         self.worker = GoogleFontsWorker()
-        self.worker.font_found.connect(self.add_font_card)
+        self.worker.catalog_loaded.connect(self.set_catalog)
         self.worker.start()
 
+    def choose_catalog(self):
+        path, _ = QFileDialog.getOpenFileName(self, tr("choose_catalog"), "", "JSON (*.json)")
+        if path:
+            self.set_catalog_source(path)
+
+    def choose_catalog_folder(self):
+        """A checkout of github.com/google/fonts (METADATA.pb per family)"""
+        folder = QFileDialog.getExistingDirectory(self, tr("choose_catalog_folder"))
+        if folder:
+            self.set_catalog_source(folder)
+
+    def set_catalog_source(self, path):
+        from config import save_settings
+        SETTINGS['google_fonts_catalog'] = path
+        save_settings()
+        self.load_fonts()
+
+    def set_catalog(self, catalog):
+        self.catalog = catalog
+        for facet, box in self.facet_boxes.items():
+            values = catalog.values(facet)
+            box.blockSignals(True)
+            box.clear()
+            box.addItems([tr(f"{facet}_all"), *(f"{self.facet_label(facet, value)} ({count})"
+                                                for value, count in values)])
+            box.setCurrentIndex(0)
+            box.blockSignals(False)
+            self.facet_values[facet] = [None, *(value for value, _ in values)]
+        self.apply_filters()
+
+    @staticmethod
+    def facet_label(facet, value):
+        if facet == 'type' or (facet == 'category' and value in CATEGORIES):
+            return tr(f"{facet}_{value}")
+        return value
+
+    def filter_list(self, text):
+        self.apply_filters()
+
+    def apply_filters(self, *_):
+        """Select the matching families (bitmap ANDs + name search) and show the first page"""
+        if self.catalog is None:
+            return
+        filters = {facet: self.facet_values[facet][max(0, box.currentIndex())]
+                   for facet, box in self.facet_boxes.items()}
+        self.results = self.catalog.select(self.searchBox.text(), filters)
+        self.countLabel.setText(tr("family_count").format(len(self.results)))
+        self.scrollContent.setUpdatesEnabled(False)
+        try:
+            for card in self.cards[:self.shown]:
+                card.hide()
+            self.shown = 0
+            self.scrollArea.verticalScrollBar().setValue(0)
+            self.show_more()
+        finally:
+            self.scrollContent.setUpdatesEnabled(True)
+
+    def show_more(self):
+        """Show the next PAGE_SIZE results, reusing hidden cards before creating new ones"""
+        chunk = self.results[self.shown:self.shown + self.PAGE_SIZE]
+        if not chunk:
+            return
+        self.scrollContent.setUpdatesEnabled(False)
+        try:
+            for i in chunk:
+                font_data = self.catalog.info(i)
+                if self.shown < len(self.cards):
+                    card = self.cards[self.shown]
+                    card.set_font_info(font_data)
+                    card.show()
+                else:
+                    card = self.add_font_card(font_data)
+                progress = self.download_progress.get(font_data['family'])
+                if progress is not None:
+                    card.set_progress(*progress)
+                self.shown += 1
+        finally:
+            self.scrollContent.setUpdatesEnabled(True)
+
+    def maybe_show_more(self, *_):
+        scrollBar = self.scrollArea.verticalScrollBar()
+        if self.shown < len(self.results) and scrollBar.value() >= scrollBar.maximum() - self.height():
+            # After the current event: the new cards' layout updates the range first
+            QTimer.singleShot(0, self.show_more)
+
     def add_font_card(self, font_data):
         card = GoogleFontCard(font_data)
         card.download_requested.connect(self.download_font)
         self.scrollLayout.addWidget(card)
-        self.font_cards.append((font_data['family'].lower(), card))
+        self.cards.append(card)
+        return card
 
-    def filter_list(self, text):
-        text = text.lower()
-        for name, card in self.font_cards:
-            if text in name: card.show()
-            else: card.hide()
+    def card_for(self, family):
+        """Card showing `family`, if its page is shown"""
+        for card in self.cards[:self.shown]:
+            if card.font_info.get('family') == family:
+                return card
+        return None
 
     def download_font(self, family, style):
         """Download and install a font from Google Fonts"""
-        # Find the font data
-        url = None
-        for name, card in self.font_cards:
-            if card.font_info.get('family') == family:
-                url = card.font_info.get('url')
-                break
+        i = self.catalog.index(family) if self.catalog else None
+        info = self.catalog.info(i) if i is not None else {}
+        url = info.get('url')
 
         if url:
             filename = f"{family.replace(' ', '_')}.ttf"
-            worker = DownloadWorker(url, filename)
-            worker.finished.connect(lambda u, path: self.on_download_finished(u, path, family))
-            worker.start()
-            self.download_workers[family] = worker
-
-    def on_download_finished(self, url, local_path, family):
+            self.downloads[url] = family
+            self.download_progress[family] = (0, 0)
+            download_manager().download(url, filename, info.get('sha256'))
+        else:
+            # e.g. fonts.google.com metadata: no file URLs
+            card = self.card_for(family)
+            if card:
+                card.on_download_finished(None)
+
+    def on_download_progress(self, url, received, total):
+        family = self.downloads.get(url)
+        if family is None:
+            return
+        self.download_progress[family] = (received, total)
+        card = self.card_for(family)
+        if card:
+            card.set_progress(received, total)
+
+    def on_download_finished(self, url, local_path):
         """Handle downloaded font"""
-        # Find the card that requested this download
-        for name, card in self.font_cards:
-            if card.font_info.get('family') == family:
-                if local_path and os.path.exists(local_path):
-                    card.on_download_finished(local_path)
-
-                    # Auto-install the downloaded font
-                    try:
-                        success = install_font_system(local_path)
-                        if success:
-                            from qfluentwidgets import InfoBar, InfoBarPosition
-                            InfoBar.success(
-                                tr("success_title"),
-                                f"Police {family} installée avec succès",
-                                duration=3000,
-                                position=InfoBarPosition.TOP_RIGHT,
-                                parent=self
-                            )
-                        else:
-                            from qfluentwidgets import InfoBar, InfoBarPosition
-                            InfoBar.error(
-                                "Erreur",
-                                f"Échec de l'installation de {family}",
-                                duration=3000,
-                                position=InfoBarPosition.TOP_RIGHT,
-                                parent=self
-                            )
-                    except Exception as e:
-                        from qfluentwidgets import InfoBar, InfoBarPosition
-                        InfoBar.error(
-                            "Erreur",
-                            f"Erreur: {str(e)}",
-                            duration=3000,
-                            position=InfoBarPosition.TOP_RIGHT,
-                            parent=self
-                        )
-                else:
-                    card.on_download_finished(None)
-                break
+        family = self.downloads.pop(url, None)
+        if family is None:
+            # Not one of this page's downloads
+            return
+        self.download_progress.pop(family, None)
+        # The card may show another family if the filters changed meanwhile
+        card = self.card_for(family)
+        if not (local_path and os.path.exists(local_path)):
+            if card:
+                card.on_download_finished(None)
+            return
+        if card:
+            card.on_download_finished(local_path)
+
+        # Auto-install the downloaded font
+        try:
+            success = install_font_system(local_path)
+            if success:
+                from qfluentwidgets import InfoBar, InfoBarPosition
+                InfoBar.success(
+                    tr("success_title"),
+                    f"Police {family} installée avec succès",
+                    duration=3000,
+                    position=InfoBarPosition.TOP_RIGHT,
+                    parent=self
+                )
+            else:
+                from qfluentwidgets import InfoBar, InfoBarPosition
+                InfoBar.error(
+                    "Erreur",
+                    f"Échec de l'installation de {family}",
+                    duration=3000,
+                    position=InfoBarPosition.TOP_RIGHT,
+                    parent=self
+                )
+        except Exception as e:
+            from qfluentwidgets import InfoBar, InfoBarPosition
+            InfoBar.error(
+                "Erreur",
+                f"Erreur: {str(e)}",
+                duration=3000,
+                position=InfoBarPosition.TOP_RIGHT,
+                parent=self
+            )
 
 class SettingsPage(QFrame):
     """Page des paramètres de l'application"""
@@ -448,6 +643,8 @@ class SettingsPage(QFrame):
         self._create_restart_card(containerLayout)
         self._create_animation_card(containerLayout)
         self._create_transparency_card(containerLayout)
+        self._create_workers_card(containerLayout)
+        self._create_scratch_card(containerLayout)
 
         containerLayout.addStretch(1)
         mainLayout.addWidget(containerWidget, 1)
@@ -557,7 +754,39 @@ class SettingsPage(QFrame):
         )
         container.addWidget(card, 0, Qt.AlignHCenter)
 
+    def _create_workers_card(self, container):
+        self.workersCombo = ComboBox(self)
+        self.workersCombo.setFixedWidth(110)
+        self.workersCombo.addItems(["Auto", "1", "2", "4", "8"])
+        workers = SETTINGS.get("analysis_workers", 0)
+        self.workersCombo.setCurrentText(str(workers) if workers else "Auto")
+        self.workersCombo.currentTextChanged.connect(self.change_workers)
+
+        card = self._create_setting_card(
+            tr("analysis_workers"),
+            tr("analysis_workers_desc"),
+            self.workersCombo
+        )
+        container.addWidget(card, 0, Qt.AlignHCenter)
+
+    SCRATCH_QUOTAS = {"256 MB": 256, "512 MB": 512, "1 GB": 1024, "2 GB": 2048}
 
+    def _create_scratch_card(self, container):
+        self.scratchCombo = ComboBox(self)
+        self.scratchCombo.setFixedWidth(110)
+        self.scratchCombo.addItems(list(self.SCRATCH_QUOTAS))
+        quota = SETTINGS.get("scratch_quota_mb", 512)
+        for text, mb in self.SCRATCH_QUOTAS.items():
+            if mb == quota:
+                self.scratchCombo.setCurrentText(text)
+        self.scratchCombo.currentTextChanged.connect(self.change_scratch_quota)
+
+        card = self._create_setting_card(
+            tr("scratch_quota"),
+            tr("scratch_quota_desc"),
+            self.scratchCombo
+        )
+        container.addWidget(card, 0, Qt.AlignHCenter)
 
     def change_theme(self, text):
         from config import save_settings
@@ -602,6 +831,18 @@ class SettingsPage(QFrame):
         if hasattr(self.window(), 'toggle_animation'):
             self.window().toggle_animation(checked)
 
+    def change_workers(self, text):
+        """Number of processes used by AnalyzeWorker (0 = automatic)"""
+        from config import save_settings
+        SETTINGS["analysis_workers"] = 0 if text == "Auto" else int(text)
+        save_settings()
+
+    def change_scratch_quota(self, text):
+        """Disk space kept for extracted and downloaded fonts"""
+        from config import save_settings
+        SETTINGS["scratch_quota_mb"] = self.SCRATCH_QUOTAS[text]
+        save_settings()
+
     def change_transparency(self, text):
         """Change window transparency effect"""
         from config import save_settings
@@ -1,6 +1,6 @@
 import os
 from PySide6.QtCore import Qt, QSize, Signal
-from PySide6.QtGui import QFont, QColor, QIcon, QPixmap
+from PySide6.QtGui import QFont, QColor, QIcon, QPixmap, QFontDatabase
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel,
     QGraphicsOpacityEffect, QWidget, QScrollArea, QFrame
@@ -10,6 +10,7 @@ from qfluentwidgets import (
     PushButton, ToolButton, FluentIcon as FIF, TextEdit
 )
 
+from archive import is_member_path, read_source, source_stat
 from config import tr
 from core import create_preview_pixmap
 
@@ -117,11 +118,13 @@ class FontPreviewWindow(QDialog):
         add_meta_item(tr("style"), metadata.get('style', 'Regular'))
         add_meta_item(tr("version"), metadata.get('version', '1.0'))
 
-        # File size
+        # File size (archive members: the uncompressed size)
         try:
-            size_kb = os.path.getsize(self.font_data.get('path', '')) // 1024
-            add_meta_item(tr("size"), f"{size_kb} KB")
-        except:
+            size = self.font_data.get('file_size')
+            if size is None:
+                size, _ = source_stat(self.font_data.get('path', ''))
+            add_meta_item(tr("size"), f"{size // 1024} KB")
+        except Exception:
             add_meta_item(tr("size"), tr("unknown"))
 
         meta_layout.addStretch(1)
@@ -152,8 +155,14 @@ class FontPreviewWindow(QDialog):
         # We'll try to load it temporarily.
 
         font_id = -1
-        if font_path and os.path.exists(font_path):
-            from PySide6.QtGui import QFontDatabase
+        if font_path and is_member_path(font_path):
+            # Virtual <archive>::<member> path: load the member's bytes
+            try:
+                font_id = QFontDatabase.addApplicationFontFromData(read_source(font_path))
+            except Exception:
+                # Unreadable member: fall back to the family name below
+                pass
+        elif font_path and os.path.exists(font_path):
             font_id = QFontDatabase.addApplicationFont(font_path)
 
         if font_id != -1:
@@ -0,0 +1,100 @@
+# Stand-in for bin/SystemOps.ps1 to exercise font registration without Windows.
+# Same arguments and output; "registering" only copies into a fonts folder.
+#
+# Usage: UFI_SYSTEM_OPS="python sysops_standin.py" python src/main.py
+# Fonts folder: $UFI_FONTS_DIR, or $WINDIR/Fonts
+import os
+import sys
+import json
+import shutil
+
+
+def fonts_dir():
+    path = os.environ.get('UFI_FONTS_DIR') or os.path.join(os.environ.get('WINDIR', '.'), 'Fonts')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def register(path, name):
+    dest = os.path.join(fonts_dir(), os.path.basename(path))
+    if os.path.abspath(path) != os.path.abspath(dest):
+        shutil.copyfile(path, dest)
+
+
+def unregister(file_name):
+    dest = os.path.join(fonts_dir(), file_name)
+    if os.path.exists(dest):
+        os.remove(dest)
+
+
+def write_result(index, error=None):
+    result = {"id": index, "status": "ERROR" if error else "SUCCESS", "message": error or ""}
+    print(json.dumps(result), flush=True)
+
+
+def run_batch(manifest, action):
+    with open(manifest, encoding='utf-8') as f:
+        items = json.load(f)
+    for index, item in enumerate(items):
+        try:
+            action(item)
+            write_result(index)
+        except Exception as e:
+            write_result(index, str(e))
+
+
+def serve():
+    """JSON-lines host, same protocol as SystemOps.ps1 -Command serve"""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            op = request.get('op')
+            if op == "register":
+                register(request['path'], request.get('name', ''))
+            elif op == "unregister":
+                unregister(request['path'])
+            elif op not in ("restart-explorer", "ping"):
+                raise ValueError(f"Unknown op: {op}")
+            write_result(request_id)
+        except Exception as e:
+            write_result(request_id, str(e))
+
+
+def parse_args(argv):
+    # PowerShell-style "-Name value" pairs
+    args = {}
+    for i in range(0, len(argv) - 1, 2):
+        args[argv[i].lstrip('-').lower()] = argv[i + 1]
+    return args
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    command = args.get('command')
+    try:
+        if command == "register":
+            register(args['fontpath'], args.get('fontname', ''))
+            print("SUCCESS")
+        elif command == "unregister":
+            unregister(args['fontpath'])
+            print("SUCCESS")
+        elif command == "register-batch":
+            run_batch(args['manifest'], lambda item: register(item['path'], item.get('name', '')))
+        elif command == "serve":
+            serve()
+        elif command == "restart-explorer":
+            print("RESTARTED")
+        else:
+            print("Unknown command")
+            sys.exit(1)
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()